@@ -4,6 +4,7 @@ import logging
 import os
 import re
 import sys
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
@@ -13,14 +14,59 @@ from typing import Any
 import click
 
 from .config import Config
-from .importer import Importer
-from .poster import Poster
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that relies on the stream's own buffering.
+
+    The default handler flushes after every record. Records here share
+    sys.stdout's buffer with click.echo output (so ordering is preserved) and
+    are flushed on WARNING and above, every `flush_every` records, or by a
+    background timer at most `flush_interval` seconds after the first unflushed
+    record, so CI logs stay live even through long quiet steps and a killed job
+    loses at most a moment of output. logging.shutdown() flushes the rest on exit.
+    """
+
+    def __init__(self, stream=None, flush_every: int = 50, flush_interval: float = 1.0):
+        super().__init__(stream)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._timer: threading.Timer | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if record.levelno >= logging.WARNING or self._pending >= self.flush_every:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        # Called from emit (lock already held), the timer thread and logging.shutdown().
+        self.acquire()
+        try:
+            super().flush()
+            self._pending = 0
+            timer, self._timer = self._timer, None
+        finally:
+            self.release()
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    handlers=[_BufferedStreamHandler(sys.stdout)],
 )
 # Reduce noise from libraries
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -256,6 +302,8 @@ def post(
     year_start_limit: int,
 ):
     """Run the daily posting job."""
+    from .poster import Poster
+
     config = Config.load(ctx.obj.get("env_file"))
     poster = Poster(config)
 
@@ -308,6 +356,8 @@ def post(
 @click.pass_context
 def catchup(ctx, limit: int, dry_run: bool, platform: str):
     """Run catch-up posts only."""
+    from .poster import Poster
+
     config = Config.load(ctx.obj.get("env_file"))
     poster = Poster(config)
 
@@ -348,6 +398,8 @@ def catchup(ctx, limit: int, dry_run: bool, platform: str):
 @click.pass_context
 def test_post(ctx, page_id: str, platform: str):
     """Test post a specific Notion page."""
+    from .poster import Poster
+
     config = Config.load(ctx.obj.get("env_file"))
     poster = Poster(config)
 
@@ -420,6 +472,8 @@ def refresh_token(ctx):
 @click.pass_context
 def list_works(ctx, student: str | None, unposted: bool):
     """List all work items from Notion."""
+    from .poster import Poster
+
     config = Config.load(ctx.obj.get("env_file"))
     poster = Poster(config)
 
@@ -460,6 +514,11 @@ def list_works(ctx, student: str | None, unposted: bool):
 @click.option("--light-quality", default=75, show_default=True, help="JPEG quality for light images")
 @click.option("--overwrite-thumbs", is_flag=True, help="Regenerate thumbnails even if they exist")
 @click.option("--overwrite-light", is_flag=True, help="Regenerate light images even if they exist")
+@click.option(
+    "--thumb-index-cache",
+    is_flag=True,
+    help="Reuse a local listing of R2 thumbnails for 24h (for repeated local runs, not CI)",
+)
 @click.pass_context
 def export_gallery_json(
     ctx,
@@ -472,23 +531,27 @@ def export_gallery_json(
     light_quality: int,
     overwrite_thumbs: bool,
     overwrite_light: bool,
+    thumb_index_cache: bool,
 ):
     """Export gallery.json from Notion and upload to R2."""
     config = Config.load(ctx.obj.get("env_file"), allow_missing_instagram=True)
     from .gallery_exporter import GalleryExporter
 
-    exporter = GalleryExporter(config)
-    _, stats = exporter.export(
-        output_path=output,
-        upload=not no_upload,
-        generate_thumbs=not no_thumbs,
-        thumb_width=thumb_width,
-        generate_light_images=not no_light,
-        light_max_size=light_max_size,
-        light_quality=light_quality,
-        overwrite_thumbs=overwrite_thumbs,
-        overwrite_light_images=overwrite_light,
-    )
+    exporter = GalleryExporter(config, thumb_index_cache=thumb_index_cache)
+    try:
+        _, stats = exporter.export(
+            output_path=output,
+            upload=not no_upload,
+            generate_thumbs=not no_thumbs,
+            thumb_width=thumb_width,
+            generate_light_images=not no_light,
+            light_max_size=light_max_size,
+            light_quality=light_quality,
+            overwrite_thumbs=overwrite_thumbs,
+            overwrite_light_images=overwrite_light,
+        )
+    finally:
+        exporter.close()
 
     click.echo("\n" + "=" * 30)
     click.echo("Gallery Export Summary")
@@ -552,6 +615,7 @@ def post_monthly_schedule(
         resolve_target_year_month,
         save_image,
     )
+    from .poster import Poster
 
     env_target = os.environ.get("MONTHLY_SCHEDULE_TARGET", "next").strip().lower()
     if env_target not in {"current", "next"}:
@@ -733,6 +797,8 @@ def check_notion(ctx):
 @click.pass_context
 def preview_groups(ctx, folder: Path, threshold: int, max_per_group: int):
     """Preview photo grouping without importing."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
     importer.preview_groups(folder, threshold, max_per_group)
@@ -746,6 +812,8 @@ def preview_groups(ctx, folder: Path, threshold: int, max_per_group: int):
 @click.pass_context
 def export_groups(ctx, folder: Path, output: Path, threshold: int, max_per_group: int):
     """Export photo grouping to JSON for manual editing."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
     importer.export_preview(folder, output, threshold, max_per_group)
@@ -766,6 +834,8 @@ def export_groups(ctx, folder: Path, output: Path, threshold: int, max_per_group
 @click.pass_context
 def import_groups(ctx, grouping_file: Path, student: str | None, start_date: datetime | None, dry_run: bool):
     """Import photos using an edited grouping file."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
 
@@ -794,6 +864,8 @@ def import_groups(ctx, grouping_file: Path, student: str | None, start_date: dat
 @click.pass_context
 def import_direct(ctx, folder: Path, threshold: int, max_per_group: int, student: str | None, start_date: datetime | None, dry_run: bool):
     """Import photos directly from folder without manual review."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
 
@@ -825,6 +897,8 @@ def import_direct(ctx, folder: Path, threshold: int, max_per_group: int, student
 @click.pass_context
 def organize(ctx, folder: Path, threshold: int, dry_run: bool, copy: bool, output: Path | None):
     """Organize a flat folder of photos into timestamped subfolders."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
 
@@ -856,6 +930,8 @@ def organize(ctx, folder: Path, threshold: int, dry_run: bool, copy: bool, outpu
 @click.pass_context
 def import_folders(ctx, folder: Path, student: str | None, start_date: datetime | None, dry_run: bool):
     """Import each subfolder as a separate work (Work Name = Folder Name)."""
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
 
@@ -887,6 +963,8 @@ def update_locations(ctx, folder: Path, dry_run: bool):
     Does NOT create new pages, only updates existing ones based on matching Work Name.
     Useful when location data was missing during initial import.
     """
+    from .importer import Importer
+
     config = Config.load(ctx.obj.get("env_file"))
     importer = Importer(config)
 
@@ -3,11 +3,16 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Final
 
 from dotenv import load_dotenv
 
+_DEFAULT_TAGS: Final[str] = "木彫り教室生徒作品 studentwork 木彫り woodcarving"
+_DEFAULT_INSTAGRAM_BUSINESS_ACCOUNT_ID: Final[str] = "17841422021372550"
+_DEFAULT_R2_BUCKET_NAME: Final[str] = "instagram-temp"
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class InstagramConfig:
     """Instagram API configuration."""
 
@@ -24,7 +29,7 @@ class InstagramConfig:
                 app_secret=os.environ.get("INSTAGRAM_APP_SECRET", ""),
                 access_token=os.environ.get("INSTAGRAM_ACCESS_TOKEN", ""),
                 business_account_id=os.environ.get(
-                    "INSTAGRAM_BUSINESS_ACCOUNT_ID", "17841422021372550"
+                    "INSTAGRAM_BUSINESS_ACCOUNT_ID", _DEFAULT_INSTAGRAM_BUSINESS_ACCOUNT_ID
                 ),
             )
         return cls(
@@ -32,12 +37,12 @@ class InstagramConfig:
             app_secret=os.environ["INSTAGRAM_APP_SECRET"],
             access_token=os.environ["INSTAGRAM_ACCESS_TOKEN"],
             business_account_id=os.environ.get(
-                "INSTAGRAM_BUSINESS_ACCOUNT_ID", "17841422021372550"
+                "INSTAGRAM_BUSINESS_ACCOUNT_ID", _DEFAULT_INSTAGRAM_BUSINESS_ACCOUNT_ID
             ),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class XConfig:
     """X (Twitter) API configuration."""
 
@@ -54,7 +59,7 @@ class XConfig:
             access_token=os.environ.get("X_ACCESS_TOKEN", ""),
             access_token_secret=os.environ.get("X_ACCESS_TOKEN_SECRET", ""),
         )
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ThreadsConfig:
     """Threads API configuration."""
 
@@ -72,7 +77,7 @@ class ThreadsConfig:
             user_id=(os.environ.get("THREADS_USER_ID") or "").strip() or None,
         )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class R2Config:
     """Cloudflare R2 configuration."""
 
@@ -88,7 +93,7 @@ class R2Config:
             account_id=os.environ["R2_ACCOUNT_ID"],
             access_key_id=os.environ["R2_ACCESS_KEY_ID"],
             secret_access_key=os.environ["R2_SECRET_ACCESS_KEY"],
-            bucket_name=os.environ.get("R2_BUCKET_NAME", "instagram-temp"),
+            bucket_name=os.environ.get("R2_BUCKET_NAME", _DEFAULT_R2_BUCKET_NAME),
             public_url=os.environ.get("R2_PUBLIC_URL"),
         )
 
@@ -97,7 +102,7 @@ class R2Config:
         return f"https://{self.account_id}.r2.cloudflarestorage.com"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NotionConfig:
     """Notion API configuration."""
 
@@ -114,7 +119,7 @@ class NotionConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Config:
     """Application configuration."""
 
@@ -143,8 +148,7 @@ class Config:
             r2=R2Config.from_env(),
             notion=NotionConfig.from_env(),
             threads=ThreadsConfig.from_env(),
-            default_tags=os.environ.get("DEFAULT_TAGS")
-            or "木彫り教室生徒作品 studentwork 木彫り woodcarving",
+            default_tags=os.environ.get("DEFAULT_TAGS") or _DEFAULT_TAGS,
         )
 
 
@@ -4,31 +4,52 @@ from __future__ import annotations
 
 import io
 import hashlib
+import importlib
 import logging
+import multiprocessing
 import os
 import re
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-import requests
-from PIL import Image, ImageOps
+import httpx
+import orjson
 
 from .config import Config
 from .notion_db import NotionDB
 from .r2_storage import R2Storage
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 logger = logging.getLogger(__name__)
 
+# Optional: libvips shrink-on-load is much faster than a full PIL decode + resize.
+# Imported on first use (see _get_pyvips) so importing this module does not load libvips.
+_PYVIPS_UNRESOLVED = object()
+pyvips = _PYVIPS_UNRESOLVED
+
 THUMB_WIDTH_DEFAULT = 600
 THUMB_RATIO = 4 / 5
 GALLERY_JSON_KEY = "gallery.json"
+GALLERY_HASH_METADATA_KEY = "gallery-hash"
 THUMB_PREFIX = "thumbs"
 THUMB_HASH_LEN = 12
 LIGHT_MAX_SIZE_DEFAULT = 1600
 LIGHT_QUALITY_DEFAULT = 75
 LIGHT_PREFIX_SUFFIX = "-light"
+EXPORT_WORKERS_DEFAULT = 16
+HTTP_POOL_SIZE = 32
+# Opt-in local cache of the R2 thumbnail listing. Meant for repeated local runs;
+# ~/.cache does not survive between CI jobs, so there it would only add staleness.
+THUMB_INDEX_CACHE_DIR = Path.home() / ".cache" / "auto-post"
+THUMB_INDEX_CACHE_TTL_SECONDS = 24 * 60 * 60
 VOLATILE_QUERY_PARAM_KEYS = (
     "x-amz-algorithm",
     "x-amz-credential",
@@ -47,6 +68,8 @@ AUTHOR_STUDENT_ID_PROP_CANDIDATES = (
     "Student ID",
     "StudentId",
 )
+# Notion file objects keep their URL under a key named after their type.
+_FILE_URL_TYPES = frozenset(("external", "file"))
 READY_PROP_ENV = "NOTION_WORKS_READY_PROP"
 READY_PROP_CANDIDATES = (
     "整備済み",
@@ -54,7 +77,109 @@ READY_PROP_CANDIDATES = (
 )
 
 
-@dataclass
+def _get_pyvips():
+    """Return the pyvips module, or None when it (or libvips) is unavailable."""
+    global pyvips
+    if pyvips is _PYVIPS_UNRESOLVED:
+        try:
+            module = importlib.import_module("pyvips")
+        except (ImportError, OSError):  # OSError: pyvips installed but libvips missing
+            module = None
+        pyvips = module
+    return pyvips
+
+
+# Image encoding runs in worker processes (see GalleryExporter.export), so these
+# helpers are module-level to stay picklable. PIL and pyvips are imported inside
+# them so that importing this module (and the CLI) does not pay for it up front.
+def _encode_thumbnail(content: bytes, thumb_width: int) -> bytes:
+    """Center-crop to THUMB_RATIO, resize to thumb_width and encode as JPEG."""
+    thumb_height = int(thumb_width / THUMB_RATIO)
+    vips = _get_pyvips()
+    if vips is not None:
+        # thumbnail_buffer applies EXIF orientation and shrinks during JPEG decode.
+        image = vips.Image.thumbnail_buffer(
+            content,
+            thumb_width,
+            height=thumb_height,
+            crop=vips.enums.Interesting.CENTRE,
+        )
+        if image.hasalpha():
+            image = image.flatten(background=[255, 255, 255])
+        data: bytes = image.jpegsave_buffer(Q=80, strip=True, optimize_coding=True)
+        return data
+
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(content))
+    # Let libjpeg decode at a reduced DCT scale (no-op for non-JPEG). Keep 2x
+    # headroom so the crop + LANCZOS resize still works from a larger source.
+    image.draft("RGB", (thumb_width * 2, thumb_height * 2))
+    image = ImageOps.exif_transpose(image)
+    image = _center_crop(image, THUMB_RATIO)
+    image = image.resize((thumb_width, thumb_height), Image.LANCZOS).convert("RGB")
+
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=80)
+    return buf.getvalue()
+
+
+def _encode_light_image(content: bytes, max_size: int, quality: int) -> bytes:
+    """Resize so the longest side is at most max_size and encode as JPEG."""
+    from PIL import Image, ImageOps
+
+    image = Image.open(io.BytesIO(content))
+    image.draft("RGB", (max_size, max_size))
+    image = ImageOps.exif_transpose(image)
+    image = _convert_to_rgb(image)
+    image = _resize_to_max(image, max_size)
+
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _center_crop(image: Image.Image, target_ratio: float) -> Image.Image:
+    width, height = image.size
+    current_ratio = width / height
+    if current_ratio > target_ratio:
+        new_width = int(height * target_ratio)
+        left = (width - new_width) // 2
+        box = (left, 0, left + new_width, height)
+    else:
+        new_height = int(width / target_ratio)
+        top = (height - new_height) // 2
+        box = (0, top, width, top + new_height)
+    return image.crop(box)
+
+
+def _resize_to_max(image: Image.Image, max_size: int) -> Image.Image:
+    from PIL import Image
+
+    width, height = image.size
+    longest = max(width, height)
+    if longest <= max_size:
+        return image
+    scale = max_size / longest
+    new_width = max(1, int(width * scale))
+    new_height = max(1, int(height * scale))
+    return image.resize((new_width, new_height), Image.LANCZOS)
+
+
+def _convert_to_rgb(image: Image.Image) -> Image.Image:
+    from PIL import Image
+
+    if image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        alpha = image.split()[-1]
+        background.paste(image, mask=alpha)
+        return background
+    return image.convert("RGB")
+
+
+@dataclass(slots=True)
 class ExportStats:
     total_pages: int = 0
     exported: int = 0
@@ -68,11 +193,15 @@ class ExportStats:
     light_skipped_existing: int = 0
     light_failed: int = 0
 
+    def merge(self, other: ExportStats) -> None:
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
 
 class GalleryExporter:
     """Export works from Notion into gallery.json and upload to R2."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, thumb_index_cache: bool = False):
         self.config = config
         self.notion = NotionDB(
             config.notion.token,
@@ -80,9 +209,20 @@ class GalleryExporter:
             config.notion.tags_database_id,
         )
         self.r2 = R2Storage(config.r2)
+        self.http = self._create_http_session()
+        self._existing_thumbs: set[str] | None = None
+        self._thumb_index_cache = thumb_index_cache
+        # When the cached key set was actually listed from R2; appends don't move it.
+        self._thumb_index_listed_at: float | None = None
+        self._thumb_index_path = (
+            THUMB_INDEX_CACHE_DIR / f"thumbs_index-{config.r2.bucket_name}.json"
+        )
+        self._thumb_index_dirty = False
+        self._cpu_pool: ProcessPoolExecutor | None = None
 
         if not self.config.r2.public_url:
             raise ValueError("R2_PUBLIC_URL is required for gallery export")
+        self._public_base = self.config.r2.public_url.rstrip("/")
 
     def export(
         self,
@@ -95,48 +235,107 @@ class GalleryExporter:
         light_quality: int = LIGHT_QUALITY_DEFAULT,
         overwrite_thumbs: bool = False,
         overwrite_light_images: bool = False,
+        workers: int = EXPORT_WORKERS_DEFAULT,
+        image_workers: int | None = None,
     ) -> tuple[dict, ExportStats]:
+        # One timestamp per run, taken when the Notion snapshot starts.
+        self._run_ts = datetime.now(timezone.utc).isoformat()
+        # Never reuse the previous export's thumbnail set; it is re-listed (or HEADed) below.
+        self._existing_thumbs = None
         db_info = self.notion.get_database_info()
         ready_prop = self._resolve_ready_property_name(db_info)
-        pages = self.notion.list_database_pages(self.notion.database_id)
 
         tag_db_id = self._get_relation_database_id(db_info, "タグ")
         author_db_id = self._get_relation_database_id(db_info, "作者")
 
-        tag_map = self.notion.get_database_title_map(tag_db_id) if tag_db_id else {}
-        author_map = self._build_author_id_map(author_db_id) if author_db_id else {}
+        # The works/tag/author scans (and the thumbnail listing) are independent
+        # paginated round trips, so run them side by side.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pages_future = executor.submit(
+                self.notion.list_database_pages, self.notion.database_id
+            )
+            tag_future = (
+                executor.submit(self.notion.get_database_title_map, tag_db_id)
+                if tag_db_id
+                else None
+            )
+            author_future = (
+                executor.submit(self._build_author_id_map, author_db_id)
+                if author_db_id
+                else None
+            )
+            thumbs_future = (
+                executor.submit(self._list_existing_thumbs)
+                if generate_thumbs and not overwrite_thumbs
+                else None
+            )
+            pages = pages_future.result()
+            tag_map = tag_future.result() if tag_future else {}
+            author_map = author_future.result() if author_future else {}
+            if thumbs_future:
+                self._existing_thumbs = thumbs_future.result()
 
         stats = ExportStats(total_pages=len(pages))
         works: list[dict] = []
 
+        ready_pages = []
         for page in pages:
             if not self._is_page_ready(page, ready_prop):
                 stats.skipped_not_ready += 1
                 continue
-
-            work = self._parse_work_page(
-                page=page,
-                tag_map=tag_map,
-                author_map=author_map,
-                generate_thumbs=generate_thumbs,
-                thumb_width=thumb_width,
-                generate_light_images=generate_light_images,
-                light_max_size=light_max_size,
-                light_quality=light_quality,
-                overwrite_thumbs=overwrite_thumbs,
-                overwrite_light_images=overwrite_light_images,
-                stats=stats,
+            ready_pages.append(page)
+
+        # Thumbnail/light image generation is network-bound (Notion file download + R2),
+        # so pages are processed concurrently. Each page gets its own stats to avoid
+        # sharing mutable counters across threads; they are merged on the main thread.
+        # Decode/resize/encode is CPU-bound and mostly holds the GIL, so it runs on a
+        # process pool that the page threads block on. A spawn context is used because
+        # forking while those threads are running is unsafe.
+        cpu_pool = None
+        if (generate_thumbs or generate_light_images) and image_workers != 0:
+            cpu_pool = ProcessPoolExecutor(
+                max_workers=image_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
             )
-            if work:
-                works.append(work)
-                stats.exported += 1
+        self._cpu_pool = cpu_pool
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                futures = [
+                    executor.submit(
+                        self._export_page,
+                        page=page,
+                        tag_map=tag_map,
+                        author_map=author_map,
+                        generate_thumbs=generate_thumbs,
+                        thumb_width=thumb_width,
+                        generate_light_images=generate_light_images,
+                        light_max_size=light_max_size,
+                        light_quality=light_quality,
+                        overwrite_thumbs=overwrite_thumbs,
+                        overwrite_light_images=overwrite_light_images,
+                    )
+                    for page in ready_pages
+                ]
+                for future in as_completed(futures):
+                    work, page_stats = future.result()
+                    stats.merge(page_stats)
+                    if work:
+                        works.append(work)
+                        stats.exported += 1
+        finally:
+            self._cpu_pool = None
+            if cpu_pool is not None:
+                cpu_pool.shutdown()
+
+        if generate_thumbs:
+            self._save_thumb_index()
 
-        works.sort(key=lambda w: w["id"])
-        works.sort(key=lambda w: w["completed_date"], reverse=True)
+        # completed_date descending, then id ascending, in a single pass.
+        works.sort(key=lambda w: (-int(w["completed_date"].replace("-", "")), w["id"]))
 
         payload = {
             "version": 1,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": self._run_ts,
             "works": works,
         }
 
@@ -147,15 +346,113 @@ class GalleryExporter:
             )
 
         if upload:
-            self.r2.put_json(
-                payload,
-                GALLERY_JSON_KEY,
-                cache_control="max-age=300",
-                ensure_ascii=False,
-            )
+            digest = self._payload_digest(payload)
+            if self._remote_gallery_digest() == digest:
+                logger.info("gallery.json unchanged (sha256=%s). Skipping upload.", digest[:12])
+            else:
+                self.r2.put_json(
+                    payload,
+                    GALLERY_JSON_KEY,
+                    cache_control="max-age=300",
+                    metadata={GALLERY_HASH_METADATA_KEY: digest},
+                )
 
         return payload, stats
 
+    def _export_page(self, page: dict, **kwargs) -> tuple[dict | None, ExportStats]:
+        page_stats = ExportStats()
+        work = self._parse_work_page(page=page, stats=page_stats, **kwargs)
+        return work, page_stats
+
+    def _list_existing_thumbs(self) -> set[str] | None:
+        if self._thumb_index_cache:
+            cached = self._load_thumb_index()
+            if cached is not None:
+                return cached
+        try:
+            listed_at = time.time()
+            keys = self.r2.list_keys(f"{THUMB_PREFIX}/")
+        except Exception as e:
+            # Fall back to per-key HEAD requests in _thumb_exists.
+            logger.warning("Failed to list existing thumbnails: %s", e)
+            return None
+        self._thumb_index_listed_at = listed_at
+        self._thumb_index_dirty = True
+        return keys
+
+    def _load_thumb_index(self) -> set[str] | None:
+        """Load the local thumbnail key index if its R2 listing is younger than the TTL."""
+        path = self._thumb_index_path
+        try:
+            data = orjson.loads(path.read_bytes())
+            listed_at = float(data["listed_at"])
+            keys = data.get("keys", [])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+        # Expire from the listing time, not the file mtime: every save rewrites the file.
+        if time.time() - listed_at > THUMB_INDEX_CACHE_TTL_SECONDS:
+            return None
+        self._thumb_index_listed_at = listed_at
+        logger.info("Loaded %d thumbnail keys from %s", len(keys), path)
+        return set(keys)
+
+    def _save_thumb_index(self) -> None:
+        if not self._thumb_index_cache or not self._thumb_index_dirty:
+            return
+        if self._existing_thumbs is None or self._thumb_index_listed_at is None:
+            return
+        path = self._thumb_index_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(
+                orjson.dumps(
+                    {
+                        "listed_at": self._thumb_index_listed_at,
+                        "keys": sorted(self._existing_thumbs),
+                    }
+                )
+            )
+            self._thumb_index_dirty = False
+        except OSError as e:
+            logger.warning("Failed to write thumbnail index cache %s: %s", path, e)
+
+    def _invalidate_thumb_index(self) -> None:
+        # Fall back to per-key HEAD requests for the rest of the run and drop the cache.
+        self._existing_thumbs = None
+        self._thumb_index_dirty = False
+        self._thumb_index_listed_at = None
+        if self._thumb_index_cache:
+            self._thumb_index_path.unlink(missing_ok=True)
+
+    def _thumb_exists(self, key: str) -> bool:
+        existing = self._existing_thumbs
+        if existing is not None:
+            return key in existing
+        return self.r2.exists(key)
+
+    def _run_cpu(self, func: Callable[..., bytes], *args) -> bytes:
+        """Run CPU-bound image encoding on the process pool when one is active."""
+        pool = self._cpu_pool
+        if pool is None:
+            return func(*args)
+        return pool.submit(func, *args).result()
+
+    def _create_http_session(self) -> httpx.Client:
+        # HTTP/2 lets concurrent image downloads share multiplexed connections per host.
+        return httpx.Client(
+            http2=True,
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+            ),
+        )
+
+    def close(self) -> None:
+        """Close the shared HTTP client."""
+        self.http.close()
+
     def _resolve_ready_property_name(self, db_info: dict) -> str:
         properties = db_info.get("properties", {})
         preferred = (os.getenv(READY_PROP_ENV) or READY_PROP_CANDIDATES[0]).strip()
@@ -392,38 +689,44 @@ class GalleryExporter:
             return f"{prefix_text}{number_text}"
         return f"{prefix_text}-{number_text}"
 
+    # Property accessors below are on the per-page hot path: look each property up
+    # once and avoid allocating throwaway ``{}`` defaults.
     def _get_title_from_props(self, props: dict, key: str) -> str:
-        if props.get(key, {}).get("title"):
-            return "".join(t.get("plain_text", "") for t in props[key]["title"]).strip()
+        prop = props.get(key)
+        title = prop.get("title") if prop else None
+        if title:
+            return "".join(t.get("plain_text", "") for t in title).strip()
         return ""
 
     def _get_date(self, props: dict, key: str) -> str | None:
-        date_obj = props.get(key, {}).get("date")
+        prop = props.get(key)
+        date_obj = prop.get("date") if prop else None
         if date_obj and date_obj.get("start"):
             return date_obj["start"][:10]
         return None
 
     def _get_select(self, props: dict, key: str) -> str | None:
-        sel = props.get(key, {}).get("select")
+        prop = props.get(key)
+        sel = prop.get("select") if prop else None
         if sel:
             return sel.get("name")
         return None
 
     def _get_rich_text(self, props: dict, key: str) -> str | None:
-        rtext = props.get(key, {}).get("rich_text")
+        prop = props.get(key)
+        rtext = prop.get("rich_text") if prop else None
         if rtext:
             return "".join(t.get("plain_text", "") for t in rtext).strip()
         return None
 
     def _get_files(self, props: dict, key: str) -> list[str]:
-        files = props.get(key, {}).get("files", [])
-        urls = []
-        for file in files:
-            if file.get("type") == "external":
-                urls.append(file["external"]["url"])
-            elif file.get("type") == "file":
-                urls.append(file["file"]["url"])
-        return urls
+        prop = props.get(key)
+        files = prop.get("files") if prop else None
+        return [
+            file[file_type]["url"]
+            for file in files or ()
+            if (file_type := file.get("type")) in _FILE_URL_TYPES
+        ]
 
     def _get_relation_names(
         self,
@@ -431,12 +734,12 @@ class GalleryExporter:
         key: str,
         name_map: dict[str, str],
     ) -> list[str]:
-        rel = props.get(key, {})
-        if rel.get("type") != "relation":
+        rel = props.get(key)
+        if not rel or rel.get("type") != "relation":
             return []
-        ids = [r.get("id") for r in rel.get("relation", []) if r.get("id")]
-        names = [name_map.get(rid, "") for rid in ids]
-        return [n for n in names if n]
+        return [
+            name for r in rel.get("relation") or () if (name := name_map.get(r.get("id")))
+        ]
 
     def _get_tags_fallback(self, props: dict) -> list[str]:
         t_prop = props.get("タグ")
@@ -459,28 +762,24 @@ class GalleryExporter:
         stats: ExportStats,
     ) -> str | None:
         key = self._build_thumbnail_key(work_id, image_url, thumb_width)
-        if not overwrite and self.r2.exists(key):
+        if not overwrite and self._thumb_exists(key):
             stats.thumb_skipped_existing += 1
             return self._public_url(key)
 
         try:
-            resp = requests.get(image_url, timeout=30)
+            resp = self.http.get(image_url)
             resp.raise_for_status()
-            image = Image.open(io.BytesIO(resp.content))
-            image = ImageOps.exif_transpose(image)
-            image = self._center_crop(image, THUMB_RATIO)
-            image = image.resize(
-                (thumb_width, int(thumb_width / THUMB_RATIO)), Image.LANCZOS
-            ).convert("RGB")
-
-            buf = io.BytesIO()
-            image.save(buf, format="JPEG", quality=80)
-            self.r2.upload(
-                buf.getvalue(),
-                key,
-                "image/jpeg",
-                cache_control="max-age=31536000",
-            )
+            thumb = self._run_cpu(_encode_thumbnail, resp.content, thumb_width)
+            try:
+                self.r2.upload(thumb, key, "image/jpeg", cache_control="max-age=31536000")
+            except Exception:
+                # R2 disagrees with what we think exists; rebuild the index next run.
+                self._invalidate_thumb_index()
+                raise
+            existing = self._existing_thumbs
+            if existing is not None:
+                existing.add(key)
+                self._thumb_index_dirty = True
             stats.thumb_generated += 1
             return self._public_url(key)
         except Exception as e:
@@ -541,17 +840,10 @@ class GalleryExporter:
             return self._public_url(key)
 
         try:
-            resp = requests.get(image_url, timeout=30)
+            resp = self.http.get(image_url)
             resp.raise_for_status()
-            image = Image.open(io.BytesIO(resp.content))
-            image = ImageOps.exif_transpose(image)
-            image = self._convert_to_rgb(image)
-            image = self._resize_to_max(image, max_size)
-
-            buf = io.BytesIO()
-            image.save(buf, format="JPEG", quality=quality)
             self.r2.upload(
-                buf.getvalue(),
+                self._run_cpu(_encode_light_image, resp.content, max_size, quality),
                 key,
                 "image/jpeg",
                 cache_control="max-age=31536000",
@@ -563,39 +855,6 @@ class GalleryExporter:
             logger.warning("Light image generation failed (%s): %s", image_url, e)
             return None
 
-    def _center_crop(self, image: Image.Image, target_ratio: float) -> Image.Image:
-        width, height = image.size
-        current_ratio = width / height
-        if current_ratio > target_ratio:
-            new_width = int(height * target_ratio)
-            left = (width - new_width) // 2
-            box = (left, 0, left + new_width, height)
-        else:
-            new_height = int(width / target_ratio)
-            top = (height - new_height) // 2
-            box = (0, top, width, top + new_height)
-        return image.crop(box)
-
-    def _resize_to_max(self, image: Image.Image, max_size: int) -> Image.Image:
-        width, height = image.size
-        longest = max(width, height)
-        if longest <= max_size:
-            return image
-        scale = max_size / longest
-        new_width = max(1, int(width * scale))
-        new_height = max(1, int(height * scale))
-        return image.resize((new_width, new_height), Image.LANCZOS)
-
-    def _convert_to_rgb(self, image: Image.Image) -> Image.Image:
-        if image.mode in ("RGBA", "LA") or (
-            image.mode == "P" and "transparency" in image.info
-        ):
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            alpha = image.split()[-1]
-            background.paste(image, mask=alpha)
-            return background
-        return image.convert("RGB")
-
     def _build_light_key(self, image_url: str) -> str | None:
         parsed = urlparse(image_url)
         if not parsed.path:
@@ -616,10 +875,20 @@ class GalleryExporter:
         return "/".join([p for p in key_parts if p])
 
     def _public_url(self, key: str) -> str:
-        base = (self.config.r2.public_url or "").rstrip("/")
-        return f"{base}/{key}"
+        return f"{self._public_base}/{key}"
 
-    def _dump_json(self, payload: dict) -> str:
-        import json
+    def _payload_digest(self, payload: dict) -> str:
+        """Hash gallery content, ignoring updated_at so idle runs produce the same digest."""
+        content = {k: v for k, v in payload.items() if k != "updated_at"}
+        return hashlib.sha256(orjson.dumps(content, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
-        return json.dumps(payload, ensure_ascii=False, indent=2)
+    def _remote_gallery_digest(self) -> str | None:
+        try:
+            metadata = self.r2.get_metadata(GALLERY_JSON_KEY)
+        except Exception as e:
+            logger.warning("Failed to read gallery.json metadata: %s", e)
+            return None
+        return (metadata or {}).get(GALLERY_HASH_METADATA_KEY)
+
+    def _dump_json(self, payload: dict) -> str:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
@@ -31,7 +31,7 @@ class MonthlyScheduleNotionClient:
             range_start, range_end = _calendar_visible_date_range(year, month)
         tz = ZoneInfo(self.source.timezone)
 
-        body = {
+        body: dict[str, Any] = {
             "filter": {
                 "and": [
                     {
@@ -44,7 +44,8 @@ class MonthlyScheduleNotionClient:
                     },
                 ]
             },
-            "sorts": [{"property": self.source.date_property, "direction": "ascending"}],
+            # No server-side "sorts": entries are ordered below by _entry_sort_key, which
+            # also breaks ties by start time and title.
         }
 
         entries: list[ScheduleEntry] = []
@@ -141,7 +142,19 @@ def extract_month_entries_from_json(
 
     dates = payload.get("dates")
     if isinstance(dates, dict):
+        # "YYYY-MM-" of every month the range touches; canonical keys outside are skipped unparsed
+        month_prefixes = {
+            f"{d.year:04d}-{d.month:02d}-" for d in (range_start, date(year, month, 1), range_end)
+        }
         for raw_date, groups in dates.items():
+            if (
+                isinstance(raw_date, str)
+                and len(raw_date) == 10
+                and raw_date[4] == "-"
+                and raw_date[7] == "-"
+                and raw_date[:8] not in month_prefixes
+            ):
+                continue
             day = _parse_date_ymd(raw_date)
             if day is None or not (range_start <= day <= range_end):
                 continue
@@ -199,6 +212,13 @@ def _parse_date_ymd(raw: Any) -> date | None:
     value = str(raw or "").strip()
     if not value:
         return None
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        # C-implemented fast path for canonical YYYY-MM-DD; strptime (pure Python) is
+        # kept for unpadded forms like 2026-3-5.
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
     try:
         return datetime.strptime(value, "%Y-%m-%d").date()
     except ValueError:
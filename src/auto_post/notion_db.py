@@ -1,11 +1,13 @@
 """Notion database integration."""
 
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, TypeVar, cast
 from zoneinfo import ZoneInfo
 
-from notion_client import Client
+from notion_client import APIResponseError, Client
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,10 @@ PLATFORM_POSTED_PROPERTY = {
     "x": "X投稿済",
     "threads": "Threads投稿済",
 }
+DATABASE_CACHE_TTL_SECONDS = 60
+QUERY_PAGE_SIZE = 100  # Notion's maximum page_size
+
+_T = TypeVar("_T")
 
 
 @dataclass
@@ -36,6 +42,7 @@ class WorkItem:
     x_post_id: str | None
     threads_posted: bool
     threads_post_id: str | None
+    error_log: str | None = None
 
 
 class NotionDB:
@@ -48,6 +55,18 @@ class NotionDB:
         self.known_properties = None
         self._property_schema = None
         self._schema_fetch_failed = False
+        # database_id -> (fetched_at, value); short-lived so schema edits show up quickly.
+        self._db_info_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._title_map_cache: dict[str, tuple[float, dict[str, str]]] = {}
+        # Related (author/tag) page titles; the same few pages recur across many works.
+        self._page_title_cache: dict[str, str] = {}
+
+    @staticmethod
+    def _cache_get(cache: dict[str, tuple[float, _T]], key: str) -> _T | None:
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < DATABASE_CACHE_TTL_SECONDS:
+            return entry[1]
+        return None
 
     def _ensure_schema(self) -> None:
         if self._property_schema is None:
@@ -94,7 +113,7 @@ class NotionDB:
                 return existing
 
             # Create new page
-            db = self.client.databases.retrieve(database_id)
+            db = self.get_database_info(database_id)
             title_prop = self.get_title_property_name(db)
             if not title_prop:
                 logger.warning("No title property for database %s", database_id)
@@ -113,7 +132,7 @@ class NotionDB:
     def _find_page_id_by_title(self, database_id: str, title: str) -> str | None:
         """Find a page in a database by its title property."""
         try:
-            db = self.client.databases.retrieve(database_id)
+            db = self.get_database_info(database_id)
             title_prop = self.get_title_property_name(db)
             if not title_prop:
                 return None
@@ -124,7 +143,9 @@ class NotionDB:
                     "filter": {
                         "property": title_prop,
                         "title": {"equals": title},
-                    }
+                    },
+                    # Only the first match is used; don't page through duplicates.
+                    "page_size": 1,
                 },
             )
             if response.get("results"):
@@ -253,41 +274,71 @@ class NotionDB:
         logger.info(f"Created Notion page: {response['id']}")
         return response["id"]
 
-    def get_posts_for_date(self, target_date: datetime) -> list[WorkItem]:
-        """Get posts scheduled for a specific date."""
+    def get_posts_for_date(
+        self, target_date: datetime, platforms: list[str] | None = None
+    ) -> list[WorkItem]:
+        """
+        Get posts scheduled for a specific date.
+
+        If platforms is given, only pages still unposted on at least one of them are
+        returned, so already-finished posts are filtered out by Notion instead of locally.
+        """
         date_str = target_date.strftime("%Y-%m-%d")
 
+        filters: list[dict[str, Any]] = [
+            {
+                "property": "投稿予定日",
+                "date": {"equals": date_str},
+            },
+            {
+                "property": "スキップ",
+                "checkbox": {"equals": False}
+            },
+        ]
+        unposted_filters = [
+            {"property": prop, "checkbox": {"equals": False}}
+            for p in platforms or ()
+            if (prop := PLATFORM_POSTED_PROPERTY.get(p))
+        ]
+        if len(unposted_filters) > 1:
+            filters.append({"or": unposted_filters})
+        elif unposted_filters:
+            filters.append(unposted_filters[0])
+
         response = self.client.request(
             path=f"databases/{self.database_id}/query",
             method="POST",
-            body={
-                "filter": {
-                    "and": [
-                        {
-                            "property": "投稿予定日",
-                            "date": {"equals": date_str},
-                        },
-                        {
-                            "property": "スキップ",
-                            "checkbox": {"equals": False}
-                        },
-                    ]
-                }
-            },
+            body={"filter": {"and": filters}},
         )
 
         return [self._parse_page(page) for page in response["results"]]
 
+    def get_work(self, page_id: str) -> WorkItem | None:
+        """Fetch a single work item by page ID. Returns None if the page does not exist."""
+        try:
+            page = cast(dict[str, Any], self.client.pages.retrieve(page_id))
+        except APIResponseError as e:
+            if e.code == "object_not_found":
+                return None
+            raise
+        return self._parse_page(page)
+
     def _fetch_page_title(self, page_id: str) -> str:
-        """Fetch a page and return its title."""
+        """Fetch a page and return its title (memoized per client)."""
+        cached = self._page_title_cache.get(page_id)
+        if cached is not None:
+            return cached
         try:
             page = self.client.pages.retrieve(page_id)
             # Inspect properties to find title
             # Title property key is variable, but type is 'title'
+            title = ""
             for prop in page["properties"].values():
                 if prop["type"] == "title":
-                    return prop["title"][0]["plain_text"] if prop["title"] else ""
-            return ""
+                    title = prop["title"][0]["plain_text"] if prop["title"] else ""
+                    break
+            self._page_title_cache[page_id] = title
+            return title
         except Exception as e:
             logger.warning(f"Failed to fetch title for page {page_id}: {e}")
             return ""
@@ -374,6 +425,7 @@ class NotionDB:
 
         threads_posted = props.get("Threads投稿済", {}).get("checkbox", False)
         threads_post_id = self._get_rich_text(props, "Threads投稿ID")
+        error_log = self._get_rich_text(props, "エラーログ")
 
         return WorkItem(
             page_id=page["id"],
@@ -392,6 +444,7 @@ class NotionDB:
             x_post_id=x_post_id,
             threads_posted=threads_posted,
             threads_post_id=threads_post_id,
+            error_log=error_log,
         )
 
     def _get_rich_text(self, props: dict, key: str) -> str | None:
@@ -413,8 +466,15 @@ class NotionDB:
         threads_post_id: str | None = None,
         error_log: str | None = None,
         posted_date: datetime | None = None,
-    ):
-        """Update the post status in Notion."""
+        current_error_log: str | None = None,
+    ) -> str | None:
+        """
+        Update the post status in Notion.
+
+        error_log is appended to the page's existing log. Pass current_error_log (e.g. from
+        WorkItem.error_log, "" if empty) to skip re-reading the page to get it.
+        Returns the updated error log when one was written.
+        """
         properties = {}
 
         if ig_posted is not None:
@@ -457,16 +517,22 @@ class NotionDB:
 
         if error_log is not None:
             # Append to existing error log
-            page = self.client.pages.retrieve(page_id)
-            current_log = self._get_rich_text(page["properties"], "エラーログ") or ""
+            if current_error_log is None:
+                page = self.client.pages.retrieve(page_id)
+                current_error_log = self._get_rich_text(page["properties"], "エラーログ")
+            current_log = current_error_log or ""
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
             new_entry = f"{timestamp} | {error_log}"
             updated_log = f"{current_log}\n{new_entry}" if current_log else new_entry
-            properties["エラーログ"] = {"rich_text": [{"text": {"content": updated_log[:2000]}}]}
+            updated_log = updated_log[:2000]
+            properties["エラーログ"] = {"rich_text": [{"text": {"content": updated_log}}]}
+        else:
+            updated_log = None
 
         if properties:
             self.client.pages.update(page_id=page_id, properties=properties)
             logger.info(f"Updated Notion page: {page_id}")
+        return updated_log
 
 
     def list_works(self, filter_student: str | None = None, only_unposted: bool = False) -> list[WorkItem]:
@@ -501,40 +567,49 @@ class NotionDB:
                 ]
             })
 
-        query_params = {"database_id": self.database_id}
+        body = {}
         if filters:
-            query_params["filter"] = {"and": filters} if len(filters) > 1 else filters[0]
+            body["filter"] = {"and": filters} if len(filters) > 1 else filters[0]
 
-        response = self.client.request(
-            path=f"databases/{self.database_id}/query",
-            method="POST",
-            body=query_params.get("filter") and {"filter": query_params["filter"]} or {}
-        )
-        return [self._parse_page(page) for page in response["results"]]
+        pages = self._query_all_pages(self.database_id, body)
+        return [self._parse_page(page) for page in pages]
 
     def get_database_info(self, database_id: str | None = None) -> dict:
-        """Get database schema information."""
+        """Get database schema information (cached for DATABASE_CACHE_TTL_SECONDS)."""
         target_database_id = database_id or self.database_id
-        return self.client.databases.retrieve(target_database_id)
+        db_info = self._cache_get(self._db_info_cache, target_database_id)
+        if db_info is None:
+            db_info = cast(dict[str, Any], self.client.databases.retrieve(target_database_id))
+            self._db_info_cache[target_database_id] = (time.monotonic(), db_info)
+        return db_info
+
+    def list_database_pages(
+        self, database_id: str, filter_properties: list[str] | None = None
+    ) -> list[dict]:
+        """
+        List all pages in a Notion database with pagination.
 
-    def list_database_pages(self, database_id: str) -> list[dict]:
-        """List all pages in a Notion database with pagination."""
+        filter_properties limits the returned page properties to the given property IDs,
+        which keeps responses small when only a column or two is needed.
+        """
+        query = {"filter_properties": filter_properties} if filter_properties else None
+        return self._query_all_pages(database_id, {}, query=query)
+
+    def _query_all_pages(self, database_id: str, body: dict, query: dict | None = None) -> list[dict]:
+        """Run a database query and follow next_cursor until every page is fetched."""
         pages = []
-        start_cursor = None
+        request_body = {**body, "page_size": QUERY_PAGE_SIZE}
         while True:
-            body = {}
-            if start_cursor:
-                body["start_cursor"] = start_cursor
             response = self.client.request(
                 path=f"databases/{database_id}/query",
                 method="POST",
-                body=body,
+                query=query,
+                body=request_body,
             )
             pages.extend(response.get("results", []))
-            if response.get("has_more"):
-                start_cursor = response.get("next_cursor")
-            else:
+            if not response.get("has_more"):
                 break
+            request_body = {**request_body, "start_cursor": response.get("next_cursor")}
         return pages
 
     def get_title_property_name(self, database_info: dict) -> str | None:
@@ -545,14 +620,21 @@ class NotionDB:
         return None
 
     def get_database_title_map(self, database_id: str) -> dict[str, str]:
-        """Build a map of page_id -> title for a given database."""
-        db_info = self.client.databases.retrieve(database_id)
+        """Build a map of page_id -> title for a given database (cached like get_database_info)."""
+        cached = self._cache_get(self._title_map_cache, database_id)
+        if cached is not None:
+            return cached
+
+        db_info = self.get_database_info(database_id)
         title_prop = self.get_title_property_name(db_info)
         if not title_prop:
             logger.warning("No title property found for database %s", database_id)
             return {}
 
-        pages = self.list_database_pages(database_id)
+        title_prop_id = db_info["properties"][title_prop].get("id")
+        pages = self.list_database_pages(
+            database_id, filter_properties=[title_prop_id] if title_prop_id else None
+        )
         title_map: dict[str, str] = {}
         for page in pages:
             props = page.get("properties", {})
@@ -563,6 +645,7 @@ class NotionDB:
                 ).strip()
             else:
                 title_map[page["id"]] = ""
+        self._title_map_cache[database_id] = (time.monotonic(), title_map)
         return title_map
 
     def get_unscheduled_works(self, limit: int = 1, platforms: list[str] | None = None) -> list[WorkItem]:
@@ -3,8 +3,11 @@
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
 from datetime import datetime
-from typing import Callable
+from functools import partial
+from typing import Any, Callable, NamedTuple
 from zoneinfo import ZoneInfo
 
 import requests
@@ -49,7 +52,49 @@ def _env_float(name: str, default: float) -> float:
 POST_RETRY_MAX_ATTEMPTS = max(1, _env_int("POST_RETRY_MAX_ATTEMPTS", 3))
 POST_RETRY_BASE_DELAY_SECONDS = max(0, _env_int("POST_RETRY_BASE_DELAY_SECONDS", 5))
 POST_RETRY_BACKOFF_FACTOR = max(1.0, _env_float("POST_RETRY_BACKOFF_FACTOR", 2.0))
+# Throttling / temporarily unavailable responses worth retrying (honoring Retry-After)
+RETRYABLE_HTTP_STATUSES = frozenset((429, 503))
+RETRY_AFTER_MAX_SECONDS = 60.0
+IMAGE_DOWNLOAD_WORKERS = max(1, _env_int("IMAGE_DOWNLOAD_WORKERS", 8))
+R2_UPLOAD_WORKERS = max(1, _env_int("R2_UPLOAD_WORKERS", 5))
+WORK_INTERVAL_SECONDS = max(0.0, _env_float("POST_WORK_INTERVAL_SECONDS", 5.0))
+SELECTION_QUERY_WORKERS = 3  # Notion allows ~3 requests/s on average
 JST = ZoneInfo("Asia/Tokyo")
+# WorkItem flag telling whether a work is already posted on each platform
+PLATFORM_POSTED_ATTR = {
+    "instagram": "ig_posted",
+    "x": "x_posted",
+    "threads": "threads_posted",
+}
+
+
+ImagesData = list[tuple[bytes, str, str]]
+
+
+class _PostJob(NamedTuple):
+    """One platform to post a work to, as run by Poster._process_post."""
+
+    platform: str
+    label: str
+    post_fn: Callable[[ImagesData, str], str]
+    retry_exceptions: tuple[type[Exception], ...]
+
+
+class MinIntervalPacer:
+    """Keep successive calls at least `interval` seconds apart, sleeping only for what is left."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._last_start: float | None = None
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if self._last_start is not None:
+            remaining = self.interval - (now - self._last_start)
+            if remaining > 0:
+                time.sleep(remaining)
+                now = time.monotonic()
+        self._last_start = now
 
 
 def _now_jst() -> datetime:
@@ -126,9 +171,43 @@ def generate_caption(
     return combined_tags_str
 
 
+def _create_download_session() -> requests.Session:
+    """Session whose connection pool lets concurrent downloads reuse TLS connections."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=IMAGE_DOWNLOAD_WORKERS,
+        pool_maxsize=IMAGE_DOWNLOAD_WORKERS,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_DOWNLOAD_SESSION = _create_download_session()
+
+
+def _retry_after_seconds(response: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying: numeric Retry-After if sent, else exponential backoff."""
+    try:
+        wait_seconds = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        wait_seconds = POST_RETRY_BASE_DELAY_SECONDS * (POST_RETRY_BACKOFF_FACTOR ** (attempt - 1))
+    return min(max(0.0, wait_seconds), RETRY_AFTER_MAX_SECONDS)
+
+
 def download_image_from_url(url: str) -> tuple[bytes, str]:
     """Download image from URL. Returns (content, filename)."""
-    response = requests.get(url, timeout=60)
+    for attempt in range(1, POST_RETRY_MAX_ATTEMPTS + 1):
+        response = _DOWNLOAD_SESSION.get(url, timeout=60)
+        if response.status_code not in RETRYABLE_HTTP_STATUSES or attempt >= POST_RETRY_MAX_ATTEMPTS:
+            break
+        wait_seconds = _retry_after_seconds(response, attempt)
+        logger.warning(
+            f"Image download got HTTP {response.status_code} "
+            f"(attempt {attempt}/{POST_RETRY_MAX_ATTEMPTS}). Retrying in {wait_seconds:.1f}s"
+        )
+        response.close()
+        time.sleep(wait_seconds)
     response.raise_for_status()
 
     # Extract filename from URL or use default
@@ -139,6 +218,35 @@ def download_image_from_url(url: str) -> tuple[bytes, str]:
     return response.content, filename
 
 
+def _guess_image_mime_type(filename: str) -> str:
+    """Determine mime type from filename (defaults to JPEG)."""
+    lower = filename.lower()
+    if lower.endswith(".png"):
+        return "image/png"
+    if lower.endswith(".gif"):
+        return "image/gif"
+    return "image/jpeg"
+
+
+def download_images(urls: list[str]) -> list[tuple[bytes, str, str]]:
+    """
+    Download images concurrently. Returns (content, filename, mime_type) in URL order.
+
+    Downloads are I/O bound, so a small thread pool overlaps the round trips.
+    """
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(IMAGE_DOWNLOAD_WORKERS, len(urls))) as executor:
+        downloaded = list(executor.map(download_image_from_url, urls))
+
+    images_data = []
+    for content, filename in downloaded:
+        images_data.append((content, filename, _guess_image_mime_type(filename)))
+        logger.debug(f"Downloaded: {filename}")
+    return images_data
+
+
 class Poster:
     """Main posting orchestrator."""
 
@@ -149,12 +257,6 @@ class Poster:
 
         # Token Management
         self.token_manager = TokenManager(self.r2, config.instagram)
-        valid_token = self.token_manager.get_valid_token()
-
-        # Update config with valid token
-        config.instagram.access_token = valid_token
-
-        self.instagram = InstagramClient(config.instagram)
 
         # Threads Token Management
         # We need a compatible config object for TokenManager if using generic approach.
@@ -175,8 +277,24 @@ class Poster:
             fallback_token_endpoint="oauth/access_token",
             fallback_include_client_credentials=True,
         )
-        valid_threads_token = self.threads_token_manager.get_valid_token()
-        config.threads.access_token = valid_threads_token
+
+        # Each token lookup is an R2 read (plus a Graph API call when it needs checking
+        # or refreshing), so resolve both at once instead of paying for them in turn.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ig_token_future = executor.submit(self.token_manager.get_valid_token)
+            threads_token_future = executor.submit(self.threads_token_manager.get_valid_token)
+            valid_token = ig_token_future.result()
+            valid_threads_token = threads_token_future.result()
+
+        # Config objects are frozen; swap in the valid tokens via replace()
+        config = replace(
+            config,
+            instagram=replace(config.instagram, access_token=valid_token),
+            threads=replace(config.threads, access_token=valid_threads_token),
+        )
+        self.config = config
+
+        self.instagram = InstagramClient(config.instagram)
         self.threads = ThreadsClient(config.threads)
 
         self.x = XClient(config.x)
@@ -273,31 +391,49 @@ class Poster:
 
         # --- Phase 1: Selection ---
 
+        # All selection queries are independent Notion round trips, so issue them
+        # side by side; results are still applied in the order below.
+        with ThreadPoolExecutor(max_workers=SELECTION_QUERY_WORKERS) as executor:
+            date_future = executor.submit(
+                self.notion.get_posts_for_date, target_date, platforms=target_platforms
+            )
+            candidate_futures = {
+                p: (
+                    # Fetch a bit more than the limits to allow for skipping duplicates
+                    executor.submit(
+                        self.notion.get_catchup_candidates,
+                        p,
+                        [op for op in all_supported_platforms if op != p],
+                        limit=5,
+                    ),
+                    executor.submit(self.notion.get_basic_candidates, p, limit=10),
+                    executor.submit(
+                        self.notion.get_year_start_candidates,
+                        p,
+                        start_date=year_start_date,
+                        limit=10,
+                    ),
+                )
+                for p in target_platforms
+            }
+
         # 1. Date Designated (Global fetch, then assign to relevant platforms)
-        date_works = self.notion.get_posts_for_date(target_date)
+        date_works = date_future.result()
         logger.info(f"Found {len(date_works)} date-designated posts for {target_date.strftime('%Y-%m-%d')}")
 
         for work in date_works:
             unique_works[work.page_id] = work
             for p in target_platforms:
                 # Check if already posted on this platform
-                is_posted = False
-                if p == "instagram":
-                    is_posted = work.ig_posted
-                elif p == "x":
-                    is_posted = work.x_posted
-                elif p == "threads":
-                    is_posted = work.threads_posted
-
-                if not is_posted:
+                if not getattr(work, PLATFORM_POSTED_ATTR[p], False):
                     platform_queues[p].append(work.page_id)
 
         # 2, 3 & 4. Per-Platform Selection (Catch-up, Basic & Year-start)
         for p in target_platforms:
+            catchup_future, basic_future, year_start_future = candidate_futures[p]
+
             # 2. Catch-up Post (Limit 1)
-            other_platforms = [op for op in all_supported_platforms if op != p]
-            # Fetch candidates (fetch a bit more to allow for skipping duplicates)
-            catchup_candidates = self.notion.get_catchup_candidates(p, other_platforms, limit=5)
+            catchup_candidates = catchup_future.result()
 
             added_count = self._add_candidates_to_queue(
                 queue=platform_queues[p],
@@ -310,7 +446,7 @@ class Poster:
                 logger.info(f"[{p}] Added {added_count} catch-up posts")
 
             # 3. Basic Post (Limit 3)
-            basic_candidates = self.notion.get_basic_candidates(p, limit=10)
+            basic_candidates = basic_future.result()
 
             added_count = self._add_candidates_to_queue(
                 queue=platform_queues[p],
@@ -323,11 +459,7 @@ class Poster:
                 logger.info(f"[{p}] Added {added_count} basic posts")
 
             # 4. Year-start Post (from Jan 1st of target year)
-            year_start_candidates = self.notion.get_year_start_candidates(
-                p,
-                start_date=year_start_date,
-                limit=10,
-            )
+            year_start_candidates = year_start_future.result()
 
             added_count = self._add_candidates_to_queue(
                 queue=platform_queues[p],
@@ -360,6 +492,7 @@ class Poster:
             key=lambda w: w.creation_date if w.creation_date else datetime.max
         )
 
+        pacer = MinIntervalPacer(WORK_INTERVAL_SECONDS)
         for work in sorted_works:
             # Determine which platforms this work is targeted for
             target_ps = [p for p, q in platform_queues.items() if work.page_id in q]
@@ -367,6 +500,8 @@ class Poster:
             if not target_ps:
                 continue
 
+            if not dry_run:
+                pacer.wait()  # Global rate limit between works
             try:
                 # Pass specific target platforms to _process_post
                 post_results = self._process_post(work, dry_run=dry_run, platforms=target_ps)
@@ -381,12 +516,14 @@ class Poster:
                 if post_results.get("errors"):
                     for err in post_results["errors"]:
                         results["errors"].append(f"{work.work_name} ({err})")
-
-                time.sleep(5)  # Global rate limit between works
             except Exception as e:
                 logger.error(f"Failed to process post {work.work_name}: {e}")
                 results["errors"].append(f"{work.work_name} ({e})")
-                self.notion.update_post_status(work.page_id, error_log=f"Processing error: {e}")
+                self.notion.update_post_status(
+                    work.page_id,
+                    error_log=f"Processing error: {e}",
+                    current_error_log=work.error_log or "",
+                )
 
         return results
 
@@ -436,6 +573,7 @@ class Poster:
             key=lambda w: w.creation_date if w.creation_date else datetime.max
         )
 
+        pacer = MinIntervalPacer(WORK_INTERVAL_SECONDS)
         for work in sorted_works:
             # Determine target platforms for this work
             target_ps = [p for p, q in platform_queues.items() if work.page_id in q]
@@ -443,6 +581,8 @@ class Poster:
             if not target_ps:
                 continue
 
+            if not dry_run:
+                pacer.wait()
             try:
                 post_results = self._process_post(work, dry_run=dry_run, platforms=target_ps)
                 results["processed"].append(work.work_name)
@@ -456,8 +596,6 @@ class Poster:
                 if post_results.get("errors"):
                     for err in post_results["errors"]:
                         results["errors"].append(f"{work.work_name} ({err})")
-
-                time.sleep(5)
             except Exception as e:
                 logger.error(f"Failed to process post {work.work_name}: {e}")
                 results["errors"].append(f"{work.work_name} ({e})")
@@ -466,7 +604,7 @@ class Poster:
 
     def _process_post(self, post: WorkItem, dry_run: bool = False, platforms: list[str] | None = None) -> dict:
         """Process a single post. Returns dict of success status by platform."""
-        status = {"instagram": False, "x": False, "threads": False, "errors": []}
+        status: dict[str, Any] = {"instagram": False, "x": False, "threads": False, "errors": []}
 
         if platforms is None:
             platforms = ["instagram", "threads", "x"]  # Default to all
@@ -490,108 +628,112 @@ class Poster:
             logger.info(f"  Images: {len(post.image_urls)}")
             logger.info(f"  Caption:\n{caption}\n")
 
-        # Download images from URLs
-        images_data = []
-        for url in post.image_urls:
-            content, filename = download_image_from_url(url)
-            # Determine mime type from filename
-            mime_type = "image/jpeg"
-            if filename.lower().endswith(".png"):
-                mime_type = "image/png"
-            elif filename.lower().endswith(".gif"):
-                mime_type = "image/gif"
-            images_data.append((content, filename, mime_type))
-            logger.debug(f"Downloaded: {filename}")
-
-        # Post to Instagram (if not already posted AND platform is requested)
+        images_data = download_images(post.image_urls)
+
+        jobs: list[_PostJob] = []
+        # Post only where not already posted AND the platform is requested
         if "instagram" in platforms and not post.ig_posted:
-            if dry_run:
-                logger.info("Dry Run: Would post to Instagram")
-                status["instagram"] = True
-            else:
-                try:
-                    ig_post_id = self._post_with_retry(
-                        "Instagram",
-                        lambda: self._post_to_instagram(images_data, caption),
-                        (InstagramAPIError,),
-                    )
-                    self.notion.update_post_status(
-                        post.page_id,
-                        ig_posted=True,
-                        ig_post_id=ig_post_id,
-                        posted_date=_now_jst()
-                    )
-                    status["instagram"] = True
-                    logger.info(f"Instagram posted: {ig_post_id}")
-                except InstagramAPIError as e:
-                    logger.error(f"Instagram error: {e}")
-                    self.notion.update_post_status(post.page_id, error_log=f"Instagram: {e}")
-                    status["errors"].append(f"Instagram: {e}")
-                    # status["instagram"] stays False
-
-        # Post to X (if not already posted AND platform is requested)
+            jobs.append(
+                _PostJob("instagram", "Instagram", self._post_to_instagram, (InstagramAPIError,))
+            )
         if "x" in platforms and not post.x_posted:
-            if dry_run:
-                logger.info("Dry Run: Would post to X")
-                status["x"] = True
-            else:
-                try:
-                    x_post_id = self._post_with_retry(
-                        "X",
-                        lambda: self._post_to_x(images_data, caption),
-                        (XAPIError,),
-                    )
-                    self.notion.update_post_status(
-                        post.page_id,
-                        x_posted=True,
-                        x_post_id=x_post_id,
-                        posted_date=_now_jst()
-                    )
-                    status["x"] = True
-                    logger.info(f"X posted: {x_post_id}")
-                except XAPIError as e:
-                    logger.error(f"X error: {e}")
-                    self.notion.update_post_status(post.page_id, error_log=f"X: {e}")
-                    status["errors"].append(f"X: {e}")
-
-        # Post to Threads (if not already posted AND platform is requested)
+            jobs.append(_PostJob("x", "X", self._post_to_x, (XAPIError,)))
         if "threads" in platforms and hasattr(post, 'threads_posted') and not post.threads_posted:
-            if dry_run:
-                logger.info("Dry Run: Would post to Threads")
-                status["threads"] = True
-            else:
+            jobs.append(_PostJob("threads", "Threads", self._post_to_threads, (ThreadsAPIError,)))
+
+        if dry_run:
+            for job in jobs:
+                logger.info(f"Dry Run: Would post to {job.label}")
+                status[job.platform] = True
+            return status
+        if not jobs:
+            return status
+
+        # Each posted flag is written as soon as its platform succeeds, so a crash or timeout
+        # while another platform is still retrying cannot lose it (and cause a repost).
+        # Only the error log is batched into one update at the end.
+        errors_by_platform: dict[str, str] = {}
+        unexpected_error: Exception | None = None
+        # The platforms are independent APIs, so post to all of them at once.
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            future_jobs = {
+                executor.submit(
+                    self._post_with_retry,
+                    job.label,
+                    partial(job.post_fn, images_data, caption),
+                    job.retry_exceptions,
+                ): job
+                for job in jobs
+            }
+            for future in as_completed(future_jobs):
+                job = future_jobs[future]
                 try:
-                    threads_post_id = self._post_with_retry(
-                        "Threads",
-                        lambda: self._post_to_threads(images_data, caption),
-                        (ThreadsAPIError,),
-                    )
-                    self.notion.update_post_status(
-                        post.page_id,
-                        threads_posted=True,
-                        threads_post_id=threads_post_id,
-                        posted_date=_now_jst()
-                    )
-                    status["threads"] = True
-                    logger.info(f"Threads posted: {threads_post_id}")
-                except ThreadsAPIError as e:
-                    logger.error(f"Threads error: {e}")
-                    self.notion.update_post_status(post.page_id, error_log=f"Threads: {e}")
-                    status["errors"].append(f"Threads: {e}")
+                    post_id = future.result()
+                except job.retry_exceptions as e:
+                    logger.error(f"{job.label} error: {e}")
+                    errors_by_platform[job.platform] = f"{job.label}: {e}"
+                    continue
+                except Exception as e:
+                    unexpected_error = unexpected_error or e
+                    continue
+                status[job.platform] = True
+                logger.info(f"{job.label} posted: {post_id}")
+                try:
+                    self._record_posted(post, job.platform, post_id)
+                except Exception as e:
+                    logger.error(f"Failed to record {job.label} post {post_id} in Notion: {e}")
+                    unexpected_error = unexpected_error or e
+
+        # Keep the error log in platform order regardless of completion order.
+        errors = [errors_by_platform[job.platform] for job in jobs if job.platform in errors_by_platform]
+        status["errors"] = errors
+        try:
+            self._flush_error_log(post, errors)
+        except Exception as e:
+            if unexpected_error is None:
+                raise
+            # Don't let a failed log write replace the error that is already propagating.
+            logger.error(f"Failed to write error log to Notion: {e}")
+        if unexpected_error is not None:
+            raise unexpected_error
 
         return status
 
+    def _record_posted(self, post: WorkItem, platform: str, post_id: str) -> None:
+        """Write one platform's posted flag and post id to Notion."""
+        posted_date = _now_jst()
+        if platform == "instagram":
+            self.notion.update_post_status(
+                post.page_id, ig_posted=True, ig_post_id=post_id, posted_date=posted_date
+            )
+        elif platform == "x":
+            self.notion.update_post_status(
+                post.page_id, x_posted=True, x_post_id=post_id, posted_date=posted_date
+            )
+        elif platform == "threads":
+            self.notion.update_post_status(
+                post.page_id, threads_posted=True, threads_post_id=post_id, posted_date=posted_date
+            )
+        else:
+            raise ValueError(f"Unknown platform: {platform}")
+
+    def _flush_error_log(self, post: WorkItem, errors: list[str]) -> None:
+        """Append this run's platform errors to the page's error log in one update."""
+        if not errors:
+            return
+        post.error_log = self.notion.update_post_status(
+            post.page_id,
+            error_log=" / ".join(errors),
+            current_error_log=post.error_log or "",
+        )
+
     def _post_to_instagram(self, images_data: list[tuple[bytes, str, str]], caption: str) -> str:
         """Post images to Instagram."""
         # Upload images to R2 and get presigned URLs
-        r2_keys = []
-        image_urls = []
+        r2_keys: list[str] = []
 
         try:
-            for content, filename, mime_type in images_data:
-                key, url = self.r2.upload_and_get_url(content, filename, mime_type)
-                r2_keys.append(key)
-                image_urls.append(url)
+            image_urls = self._upload_images_to_r2(images_data, r2_keys)
 
             # Post to Instagram
             # Note: Instagram's post_* methods already wait for media to be FINISHED before publishing,
@@ -603,23 +745,15 @@ class Poster:
 
         finally:
             # Clean up R2 files
-            for key in r2_keys:
-                try:
-                    self.r2.delete(key)
-                except Exception as e:
-                    logger.warning(f"Failed to delete R2 file {key}: {e}")
+            self._delete_r2_keys(r2_keys)
 
     def _post_to_threads(self, images_data: list[tuple[bytes, str, str]], caption: str) -> str:
         """Post images to Threads."""
         # Upload images to R2 and get presigned URLs
-        r2_keys = []
-        image_urls = []
+        r2_keys: list[str] = []
 
         try:
-            for content, filename, mime_type in images_data:
-                key, url = self.r2.upload_and_get_url(content, filename, mime_type)
-                r2_keys.append(key)
-                image_urls.append(url)
+            image_urls = self._upload_images_to_r2(images_data, r2_keys)
 
             # Post to Threads
             if len(image_urls) == 1:
@@ -636,11 +770,51 @@ class Poster:
 
         finally:
             # Clean up R2 files
-            for key in r2_keys:
-                try:
-                    self.r2.delete(key)
-                except Exception as e:
-                    logger.warning(f"Failed to delete R2 file {key}: {e}")
+            self._delete_r2_keys(r2_keys)
+
+    def _upload_images_to_r2(
+        self, images_data: list[tuple[bytes, str, str]], r2_keys: list[str]
+    ) -> list[str]:
+        """
+        Upload images to R2 concurrently and return presigned URLs in input order.
+
+        Keys of successful uploads are appended to r2_keys even if another upload
+        fails, so the caller's cleanup still deletes them.
+        """
+        workers = max(1, min(R2_UPLOAD_WORKERS, len(images_data)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.r2.upload_and_get_url, content, filename, mime_type)
+                for content, filename, mime_type in images_data
+            ]
+
+        image_urls = []
+        first_error = None
+        for future in futures:
+            try:
+                key, url = future.result()
+            except Exception as e:
+                first_error = first_error or e
+                continue
+            r2_keys.append(key)
+            image_urls.append(url)
+        if first_error is not None:
+            raise first_error
+        return image_urls
+
+    def _delete_r2_keys(self, r2_keys: list[str]) -> None:
+        """Delete temporary R2 files concurrently, logging (not raising) failures."""
+        if not r2_keys:
+            return
+
+        def delete(key: str) -> None:
+            try:
+                self.r2.delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to delete R2 file {key}: {e}")
+
+        with ThreadPoolExecutor(max_workers=min(R2_UPLOAD_WORKERS, len(r2_keys))) as executor:
+            list(executor.map(delete, r2_keys))
 
     def _post_to_x(self, images_data: list[tuple[bytes, str, str]], caption: str) -> str:
         """Post images to X."""
@@ -738,9 +912,7 @@ class Poster:
         Returns:
             dict with post IDs
         """
-        # Get work items and find the one with matching page_id
-        works = self.notion.list_works()
-        work = next((w for w in works if w.page_id == page_id), None)
+        work = self.notion.get_work(page_id)
 
         if work is None:
             raise ValueError(f"Work not found: {page_id}")
@@ -748,14 +920,7 @@ class Poster:
         if not work.image_urls:
             raise ValueError(f"No images for work: {work.work_name}")
 
-        # Download images
-        images_data = []
-        for url in work.image_urls:
-            content, filename = download_image_from_url(url)
-            mime_type = "image/jpeg"
-            if filename.lower().endswith(".png"):
-                mime_type = "image/png"
-            images_data.append((content, filename, mime_type))
+        images_data = download_images(work.image_urls)
 
         caption = generate_caption(
             work.work_name,
@@ -2,10 +2,14 @@
 
 import io
 import logging
+import threading
 import time
+import uuid
 from contextlib import contextmanager
+from typing import Any
 
 import boto3
+import orjson
 from botocore.config import Config as BotoConfig
 
 from .config import R2Config
@@ -13,6 +17,9 @@ from .config import R2Config
 logger = logging.getLogger(__name__)
 
 
+class R2PreconditionFailedError(Exception):
+    """A conditional put_json failed because the object changed since it was read."""
+
 
 class R2Storage:
     """Cloudflare R2 storage client using boto3."""
@@ -20,11 +27,16 @@ class R2Storage:
     def __init__(self, config: R2Config):
         self.config = config
         self._client = None
+        self._client_lock = threading.Lock()
 
     @property
     def client(self):
+        # boto3 clients are thread-safe once built, but creating them from the
+        # default session is not, so guard the lazy initialization.
         if self._client is None:
-            self._client = self._create_client()
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
         return self._client
 
     def _create_client(self):
@@ -36,6 +48,10 @@ class R2Storage:
             config=BotoConfig(
                 signature_version="s3v4",
                 retries={"max_attempts": 3, "mode": "adaptive"},
+                # botocore >= 1.36 adds CRC checksums to every request by default,
+                # which S3-compatible endpoints such as R2 do not reliably accept.
+                request_checksum_calculation="when_required",
+                response_checksum_validation="when_required",
             ),
         )
 
@@ -45,24 +61,32 @@ class R2Storage:
         key: str,
         content_type: str,
         cache_control: str | None = None,
+        metadata: dict[str, str] | None = None,
     ) -> str:
         """Upload content to R2 and return the key."""
-        # Create fresh client for every request to avoid session issues
-        client = self._create_client()
-
-        extra_args = {"ContentType": content_type}
-        if cache_control:
-            extra_args["CacheControl"] = cache_control
-
-        client.upload_fileobj(
+        self.client.upload_fileobj(
             io.BytesIO(content),
             self.config.bucket_name,
             key,
-            ExtraArgs=extra_args,
+            ExtraArgs=self._object_args(content_type, cache_control, metadata),
         )
         logger.info(f"Uploaded to R2: {key}")
         return key
 
+    @staticmethod
+    def _object_args(
+        content_type: str,
+        cache_control: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Object attributes shared by upload() and put_json()."""
+        args: dict[str, Any] = {"ContentType": content_type}
+        if cache_control:
+            args["CacheControl"] = cache_control
+        if metadata:
+            args["Metadata"] = metadata
+        return args
+
     def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
         """Generate a presigned URL for an object."""
         url = self.client.generate_presigned_url(
@@ -82,7 +106,8 @@ class R2Storage:
         self, content: bytes, filename: str, content_type: str, expires_in: int = 3600
     ) -> tuple[str, str]:
         """Upload content and return (key, presigned_url)."""
-        key = f"temp/{int(time.time())}_{filename}"
+        # Random part keeps same-second uploads of identically named files apart
+        key = f"temp/{int(time.time())}_{uuid.uuid4().hex[:8]}_{filename}"
         self.upload(content, key, content_type)
         url = self.generate_presigned_url(key, expires_in)
         return key, url
@@ -106,45 +131,119 @@ class R2Storage:
         data: dict,
         key: str,
         cache_control: str | None = None,
-        ensure_ascii: bool = True,
-    ):
-        """Save a dictionary as JSON to R2."""
-        import json
+        ensure_ascii: bool = False,
+        metadata: dict[str, str] | None = None,
+        if_match: str | None = None,
+        if_none_match: str | None = None,
+    ) -> str | None:
+        """
+        Save a dictionary as JSON to R2 and return the new object's ETag.
+
+        Serialized with orjson (compact UTF-8). ensure_ascii=True escapes non-ASCII
+        characters instead, which needs the stdlib json encoder.
+
+        With if_match, the write only succeeds while the object still has that ETag;
+        if_none_match="*" only creates the object if it does not exist yet. A failed
+        condition raises R2PreconditionFailedError.
+        """
+        from botocore.exceptions import ClientError
+
         logger.info(f"Saving JSON to R2: {key}")
-        payload = json.dumps(data, ensure_ascii=ensure_ascii).encode("utf-8")
-        self.upload(payload, key, "application/json", cache_control=cache_control)
+        if ensure_ascii:
+            import json
+
+            payload = json.dumps(data, ensure_ascii=True).encode("utf-8")
+        else:
+            payload = orjson.dumps(data)
+        args = self._object_args("application/json", cache_control, metadata)
+        if if_match:
+            args["IfMatch"] = if_match
+        if if_none_match:
+            args["IfNoneMatch"] = if_none_match
+        # A single PutObject (JSON is already in memory) so the response carries the ETag.
+        try:
+            response = self.client.put_object(
+                Bucket=self.config.bucket_name, Key=key, Body=payload, **args
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "PreconditionFailed":
+                raise R2PreconditionFailedError(key) from e
+            raise
+        logger.info(f"Uploaded to R2: {key}")
+        etag: str | None = response.get("ETag")
+        return etag
 
     def get_json(self, key: str) -> dict | None:
         """Retrieve a dictionary from JSON in R2. Returns None if not found."""
-        import json
+        from botocore.exceptions import ClientError
+
+        try:
+            data, _ = self.get_json_with_etag(key)
+        except ClientError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to read JSON {key}: {e}")
+            return None
+        return data
+
+    def get_json_with_etag(self, key: str) -> tuple[dict | None, str | None]:
+        """
+        Retrieve JSON from R2 with its ETag (for put_json's if_match).
 
+        Returns (None, None) if the object does not exist, and (None, etag) if it exists
+        but its body could not be read or parsed, so callers can still overwrite it with
+        a guarded write. Request failures raise.
+        """
         from botocore.exceptions import ClientError
 
         try:
-            client = self._create_client()
-            response = client.get_object(Bucket=self.config.bucket_name, Key=key)
-            content = response["Body"].read().decode("utf-8")
-            return json.loads(content)
+            response = self.client.get_object(Bucket=self.config.bucket_name, Key=key)
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
                 logger.info(f"JSON not found in R2: {key}")
-                return None
+                return None, None
             logger.error(f"Error reading from R2 {key}: {e}")
             raise
+        etag = response.get("ETag")
+        try:
+            return orjson.loads(response["Body"].read()), etag
         except Exception as e:
             logger.error(f"Failed to read JSON {key}: {e}")
-            return None
+            return None, etag
+
+    def get_metadata(self, key: str) -> dict[str, str] | None:
+        """Return user metadata of an object, or None if it does not exist."""
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.head_object(Bucket=self.config.bucket_name, Key=key)
+            metadata: dict[str, str] = response.get("Metadata", {})
+            return metadata
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in {"404", "NoSuchKey", "NotFound"}:
+                return None
+            raise
 
     def exists(self, key: str) -> bool:
         """Check if an object exists in R2."""
         from botocore.exceptions import ClientError
 
         try:
-            client = self._create_client()
-            client.head_object(Bucket=self.config.bucket_name, Key=key)
+            self.client.head_object(Bucket=self.config.bucket_name, Key=key)
             return True
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code")
             if code in {"404", "NoSuchKey", "NotFound"}:
                 return False
             raise
+
+    def list_keys(self, prefix: str) -> set[str]:
+        """List all object keys under a prefix (paginated)."""
+        paginator = self.client.get_paginator("list_objects_v2")
+        keys: set[str] = set()
+        for page in paginator.paginate(Bucket=self.config.bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                keys.add(obj["Key"])
+        logger.debug("Listed %d keys under %s", len(keys), prefix)
+        return keys
@@ -1,16 +1,23 @@
 """Token Management Logic."""
 
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import InstagramConfig
-from .r2_storage import R2Storage
+from .r2_storage import R2PreconditionFailedError, R2Storage
 
 logger = logging.getLogger(__name__)
 
-EXPIRY_THRESHOLD_DAYS = 20  # Refresh if less than 20 days remain
+EXPIRY_THRESHOLD_DAYS = 20  # Refresh once 20 days or fewer remain
+SECONDS_PER_DAY = 86400.0
+EXPIRY_THRESHOLD_SECONDS = EXPIRY_THRESHOLD_DAYS * SECONDS_PER_DAY
+GRAPH_API_TIMEOUT = (3, 10)  # (connect, read) seconds; fail fast on unreachable hosts
 
 
 class TokenManager:
@@ -50,6 +57,29 @@ class TokenManager:
         if fallback_include_client_credentials is None:
             fallback_include_client_credentials = include_client_credentials
         self.fallback_include_client_credentials = fallback_include_client_credentials
+        # Last token known to be valid (and its expiry as a Unix timestamp),
+        # so repeat calls skip R2/Graph API
+        self._cached_token: str | None = None
+        self._cached_expires_ts: float | None = None
+        # ETag of the last R2 entry read or written, and whether the entry is known to be
+        # absent, so _save_token can guard its PUT
+        self._stored_etag: str | None = None
+        self._stored_absent = False
+        self._session = self._create_session()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Keep-alive session for Graph API calls, retrying transient gateway errors."""
+        session = requests.Session()
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(("GET",)),
+            raise_on_status=False,
+        )
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry))
+        return session
 
     def get_valid_token(self) -> str:
         """
@@ -58,78 +88,57 @@ class TokenManager:
         2. If invalid/missing, use Env token.
         3. Check expiry and refresh if needed.
         4. Return the valid string.
+        Results with a known, comfortably distant expiry are memoized on the instance.
         """
-        stored_token, expires_at = self._load_stored_token()
+        if self._cached_token and self._cached_expires_ts:
+            if self._cached_expires_ts - time.time() > EXPIRY_THRESHOLD_SECONDS:
+                return self._cached_token
+
+        stored_token, expires_ts = self._load_stored_token()
         env_token = self.config.access_token
         token = stored_token or env_token
 
-        # If we don't know expiry (e.g. from env), we should probably fetch it or force refresh?
-        # But Graph API debug_token endpoint requires a token to check itself.
+        # Common case: expiry comfortably distant, nothing to decide
+        if token and expires_ts is not None and expires_ts - time.time() > EXPIRY_THRESHOLD_SECONDS:
+            self._remember_token(token, expires_ts)
+            return token
 
-        # Let's check expiry via API if not known, or if known check against threshold
-        remaining_days = self._check_expiry(token, expires_at)
-
-        if remaining_days is not None and remaining_days < EXPIRY_THRESHOLD_DAYS:
-            logger.warning(f"Token expires in {remaining_days:.1f} days. Refreshing...")
-            if remaining_days <= 0 and env_token and env_token != token:
-                candidates = self._candidate_tokens(env_token, token)
-            else:
-                candidates = self._candidate_tokens(token, env_token)
-            new_token, new_expires_in = self._refresh_with_candidates(candidates)
-            if new_token:
-                self._save_token(new_token, new_expires_in)
-                return new_token
-            if remaining_days <= 0 and env_token and env_token != token:
-                logger.warning("Stored token expired. Falling back to env token.")
-                return env_token
-            if remaining_days <= 0:
-                logger.error("Token expired and refresh failed. Update access token in env.")
-            logger.error("Failed to refresh token. Using old token.")
+        if expires_ts is None:
+            # Unknown expiry (e.g. first run on an env token). An exchange returns expires_in,
+            # which _save_token persists, so later runs never need a debug_token lookup.
+            logger.info("Token expiry unknown. Refreshing to record it...")
+            remaining_days = None
+        else:
+            remaining_days = self._check_expiry(expires_ts)
+
+        expired = remaining_days is not None and remaining_days <= 0
+        if remaining_days is not None:
+            logger.warning("Token expires in %.1f days. Refreshing...", remaining_days)
+        if expired and env_token and env_token != token:
+            # An expired stored token cannot be exchanged; only the env token can
+            candidates = self._candidate_tokens(env_token, None)
+        else:
+            candidates = self._candidate_tokens(token, env_token)
+        new_token, new_expires_in = self._refresh_with_candidates(candidates)
+        if new_token:
+            self._save_token(new_token, new_expires_in)
+            return new_token
+        if expired and env_token and env_token != token:
+            logger.warning("Stored token expired. Falling back to env token.")
+            return env_token
+        if expired:
+            logger.error("Token expired and refresh failed. Update access token in env.")
+        logger.error("Failed to refresh token. Using old token.")
 
         return token
 
-    def _check_expiry(self, token: str, known_expires_at: datetime | None) -> float | None:
-        """
-        Check remaining days.
-        If known_expires_at is None, query API to get debug info.
-        """
-        if known_expires_at:
-            delta = known_expires_at - datetime.now()
-            return delta.days + (delta.seconds / 86400)
-
-        # Query API for expiry
-        # GET https://graph.facebook.com/debug_token?input_token={token}&access_token={token}
-        try:
-            if self.api_version:
-                url = f"{self.base_url}/{self.api_version}/debug_token"
-            else:
-                url = f"{self.base_url}/debug_token"
-            params = {
-                "input_token": token,
-                "access_token": token # debug_token endpoint uses the token itself for auth usually, or app token
-            }
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
-
-            if "data" in data and "expires_at" in data["data"]:
-                # expires_at is unix timestamp
-                ts = data["data"]["expires_at"]
-                if ts == 0: # Never expires?
-                    return 999
-                expires_at = datetime.fromtimestamp(ts)
+    def _remember_token(self, token: str, expires_ts: float) -> None:
+        self._cached_token = token
+        self._cached_expires_ts = expires_ts
 
-                # Save it so we don't query every time?
-                # Actually, if we are here, it means we didn't have it in R2.
-                # We should save it to R2 now to avoid API calls next time.
-                self._save_token(token, ts - int(datetime.now().timestamp()))
-
-                delta = expires_at - datetime.now()
-                return delta.days
-
-            return None
-        except Exception as e:
-            logger.warning(f"Failed to check token expiry: {e}")
-            return None
+    def _check_expiry(self, expires_ts: float) -> float:
+        """Return remaining days until the Unix timestamp expires_ts."""
+        return (expires_ts - time.time()) / SECONDS_PER_DAY
 
     def _refresh_token(self, current_token: str) -> tuple[str | None, int | None]:
         """
@@ -247,17 +256,17 @@ class TokenManager:
                 params["client_id"] = self.config.app_id
                 params["client_secret"] = self.config.app_secret
 
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self._session.get(url, params=params, timeout=GRAPH_API_TIMEOUT)
             resp.raise_for_status()
-            return resp.json(), None
+            return orjson.loads(resp.content), None
         except Exception as e:
             error_data = None
             status = None
             if hasattr(e, "response") and e.response is not None:
                 status = e.response.status_code
                 try:
-                    error_data = e.response.json()
-                except ValueError:
+                    error_data = orjson.loads(e.response.content)
+                except orjson.JSONDecodeError:
                     error_data = {"raw": e.response.text}
             if status is not None:
                 logger.error("Token refresh failed: HTTP %s", status)
@@ -303,26 +312,38 @@ class TokenManager:
                 logger.error("Error User Message: %s %s", user_title or "", user_msg or "")
 
     def _format_error_json(self, error_data: dict) -> str:
-        import json
-        return json.dumps(error_data, ensure_ascii=False)
+        return orjson.dumps(error_data).decode("utf-8")
 
     def _mask_token(self, token: str) -> str:
         if len(token) <= 12:
             return f"{token[:3]}...{token[-3:]}"
         return f"{token[:6]}...{token[-4:]}"
 
-    def _load_stored_token(self) -> tuple[str | None, datetime | None]:
-        """Load token and expiry from R2 storage."""
-        stored_data = self.r2.get_json(self.token_file_key)
+    def _load_stored_token(self) -> tuple[str | None, float | None]:
+        """Load token and expiry (Unix timestamp) from R2 storage."""
+        try:
+            stored_data, etag = self.r2.get_json_with_etag(self.token_file_key)
+        except Exception as e:
+            # Unknown state, not "absent": treating it as absent would make every save's
+            # If-None-Match fail against the existing entry.
+            logger.error("Failed to read stored token from R2: %s", e)
+            stored_data, etag = None, None
+            self._stored_absent = False
+        else:
+            self._stored_absent = etag is None and stored_data is None
+        self._stored_etag = etag
         if not stored_data:
             return None, None
 
         logger.info("Loaded token from R2 storage")
-        expires_at = None
-        expires_at_str = stored_data.get("expires_at")
-        if expires_at_str:
-            expires_at = datetime.fromisoformat(expires_at_str)
-        return stored_data.get("access_token"), expires_at
+        expires_ts = stored_data.get("expires_at_ts")
+        if expires_ts is None:
+            # Entries written before expires_at_ts existed only carry the ISO string
+            # (naive local time in old entries, which timestamp() interprets correctly)
+            expires_at_str = stored_data.get("expires_at")
+            if expires_at_str:
+                expires_ts = datetime.fromisoformat(expires_at_str).timestamp()
+        return stored_data.get("access_token"), expires_ts
 
     def _candidate_tokens(self, primary: str | None, fallback: str | None) -> list[str]:
         """Build a list of unique, non-empty token candidates."""
@@ -342,21 +363,51 @@ class TokenManager:
 
     def _save_token(self, token: str, expires_in_seconds: int):
         """Save token and calculated expiry to R2."""
-        expires_at = datetime.now() + timedelta(seconds=expires_in_seconds)
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=expires_in_seconds)
+        expires_ts = expires_at.timestamp()
         data = {
             "access_token": token,
             "expires_at": expires_at.isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "expires_at_ts": expires_ts,
+            "updated_at": now.isoformat()
         }
-        self.r2.put_json(data, self.token_file_key)
-        logger.info(f"Token saved to R2. Expires at: {expires_at}")
+        try:
+            # Guard against clobbering a concurrent write: match the ETag we read, or
+            # require the entry to still be absent if there was none. If the entry could
+            # not be read at all, overwrite it so a broken entry can still be repaired.
+            if_match = self._stored_etag
+            if_none_match = "*" if not if_match and self._stored_absent else None
+            if not if_match and not if_none_match:
+                logger.warning("Stored token entry could not be read. Overwriting it.")
+            etag = self.r2.put_json(
+                data, self.token_file_key, if_match=if_match, if_none_match=if_none_match
+            )
+        except R2PreconditionFailedError:
+            # Another run rewrote the entry since we read it; keep theirs, ours is still valid
+            logger.warning("Token entry in R2 changed concurrently. Keeping the stored one.")
+            self._remember_token(token, expires_ts)
+            return
+        self._stored_etag = etag
+        self._stored_absent = False
+        self._remember_token(token, expires_ts)
+        logger.info("Token saved to R2. Expires at: %s", expires_at)
 
     def force_refresh(self) -> str | None:
         """Force a token refresh and save to R2."""
-        stored_token, expires_at = self._load_stored_token()
+        stored_token: str | None
+        expires_ts: float | None
+        if self._cached_token:
+            # Token already resolved by this instance; no need to read it back from R2
+            stored_token, expires_ts = self._cached_token, self._cached_expires_ts
+        else:
+            stored_token, expires_ts = self._load_stored_token()
+        self._cached_token = None
+        self._cached_expires_ts = None
         env_token = self.config.access_token
-        if expires_at and expires_at <= datetime.now() and env_token and env_token != stored_token:
-            candidates = self._candidate_tokens(env_token, stored_token)
+        if expires_ts and expires_ts <= time.time() and env_token and env_token != stored_token:
+            # An expired stored token cannot be exchanged; only the env token can
+            candidates = self._candidate_tokens(env_token, None)
         else:
             candidates = self._candidate_tokens(stored_token, env_token)
         new_token, expires_in = self._refresh_with_candidates(candidates)
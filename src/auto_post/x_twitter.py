@@ -1,7 +1,12 @@
 """X (Twitter) API integration using tweepy."""
 
+import functools
+import io
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import tweepy
 
@@ -9,6 +14,33 @@ from .config import X_MAX_IMAGES, XConfig
 
 logger = logging.getLogger(__name__)
 
+# v1.1 media/upload limit: 615 requests per 15-minute window per user
+MEDIA_UPLOAD_LIMIT = 615
+MEDIA_UPLOAD_WINDOW_SECONDS = 900.0
+
+
+class SlidingWindowLimiter:
+    """Allow at most `limit` calls per `window` seconds, sleeping only once the window is full."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._calls: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.window:
+                    self._calls.popleft()
+                if len(self._calls) < self.limit:
+                    self._calls.append(now)
+                    return
+                wait = self.window - (now - self._calls[0])
+            time.sleep(wait)
+
+
 def _extract_tweepy_error_info(e: tweepy.TweepyException) -> tuple[int | None, object | None, str | None]:
     """Extract status/errors/body from TweepyException when available."""
     status = None
@@ -31,6 +63,42 @@ def _extract_tweepy_error_info(e: tweepy.TweepyException) -> tuple[int | None, o
     return status, api_errors, body
 
 
+@functools.lru_cache(maxsize=4)
+def _make_tweepy_client(
+    api_key: str, api_key_secret: str, access_token: str, access_token_secret: str
+) -> tweepy.Client:
+    """Build a v2 Client, shared by every XClient with the same credentials."""
+    return tweepy.Client(
+        consumer_key=api_key,
+        consumer_secret=api_key_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _make_tweepy_api(
+    api_key: str, api_key_secret: str, access_token: str, access_token_secret: str
+) -> tweepy.API:
+    """Build a v1.1 API (OAuth1), shared by every XClient with the same credentials."""
+    auth = tweepy.OAuth1UserHandler(
+        consumer_key=api_key,
+        consumer_secret=api_key_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+    )
+    return tweepy.API(auth)
+
+
+# Unbounded so an eviction can never reset a window that is still filling up.
+@functools.lru_cache(maxsize=None)
+def _get_upload_limiter(
+    api_key: str, api_key_secret: str, access_token: str, access_token_secret: str
+) -> SlidingWindowLimiter:
+    """Media upload limiter, shared like the tweepy objects since the limit is per user."""
+    return SlidingWindowLimiter(MEDIA_UPLOAD_LIMIT, MEDIA_UPLOAD_WINDOW_SECONDS)
+
+
 class XAPIError(Exception):
     """X API error."""
 
@@ -44,37 +112,34 @@ class XClient:
         self.config = config
         self._client = None
         self._api = None
+        self._upload_limiter = _get_upload_limiter(*self._credentials())
 
     @property
     def client(self) -> tweepy.Client:
         """Get tweepy Client (v2 API)."""
         if self._client is None:
-            self._client = tweepy.Client(
-                consumer_key=self.config.api_key,
-                consumer_secret=self.config.api_key_secret,
-                access_token=self.config.access_token,
-                access_token_secret=self.config.access_token_secret,
-            )
+            self._client = _make_tweepy_client(*self._credentials())
         return self._client
 
     @property
     def api(self) -> tweepy.API:
         """Get tweepy API (v1.1 API for media upload)."""
         if self._api is None:
-            auth = tweepy.OAuth1UserHandler(
-                consumer_key=self.config.api_key,
-                consumer_secret=self.config.api_key_secret,
-                access_token=self.config.access_token,
-                access_token_secret=self.config.access_token_secret,
-            )
-            self._api = tweepy.API(auth)
+            self._api = _make_tweepy_api(*self._credentials())
         return self._api
 
+    def _credentials(self) -> tuple[str, str, str, str]:
+        return (
+            self.config.api_key,
+            self.config.api_key_secret,
+            self.config.access_token,
+            self.config.access_token_secret,
+        )
+
     def upload_media(self, content: bytes, filename: str) -> str:
         """Upload media and return media_id."""
-        # tweepy requires a file-like object
-        import io
-
+        self._upload_limiter.acquire()
+        # tweepy requires a file-like object; BytesIO shares an immutable bytes buffer until written
         try:
             media = self.api.media_upload(filename=filename, file=io.BytesIO(content))
         except tweepy.TweepyException as e:
@@ -87,12 +152,12 @@ class XClient:
             if body:
                 detail_parts.append(f"body={body[:500]}")
             if detail_parts:
-                logger.error(f"X media upload error details: {', '.join(detail_parts)}")
+                logger.error("X media upload error details: %s", ", ".join(detail_parts))
             msg = f"Failed to upload media: {e}"
             if status is not None:
                 msg += f" (status {status})"
             raise XAPIError(msg) from e
-        logger.info(f"Uploaded media: {media.media_id_string}")
+        logger.info("Uploaded media: %s", media.media_id_string)
         return media.media_id_string
 
     def post_with_images(self, text: str, image_contents: list[tuple[bytes, str]]) -> str:
@@ -106,27 +171,48 @@ class XClient:
         Returns:
             Tweet ID
         """
-        # X allows max 4 images per tweet
-        images_to_post = image_contents[:X_MAX_IMAGES]
+        contents = [content for content, _ in image_contents]
+        filenames = [filename for _, filename in image_contents]
+        return self.post_with_images_soa(text, contents, filenames)
+
+    def post_with_images_soa(self, text: str, contents: list[bytes], filenames: list[str]) -> str:
+        """
+        Post a tweet with images given as parallel lists.
+
+        Args:
+            text: Tweet text
+            contents: Image bytes
+            filenames: Filenames, one per entry in contents
 
-        if len(image_contents) > X_MAX_IMAGES:
+        Returns:
+            Tweet ID
+        """
+        if len(contents) != len(filenames):
+            raise ValueError("contents and filenames must have the same length")
+
+        # X allows max 4 images per tweet
+        if len(contents) > X_MAX_IMAGES:
             logger.warning(
-                f"X only allows {X_MAX_IMAGES} images per tweet, "
-                f"posting first {X_MAX_IMAGES} of {len(image_contents)}"
+                "X only allows %d images per tweet, posting first %d of %d",
+                X_MAX_IMAGES,
+                X_MAX_IMAGES,
+                len(contents),
             )
+            contents = contents[:X_MAX_IMAGES]
+            filenames = filenames[:X_MAX_IMAGES]
 
-        # Upload images
+        # Upload images in parallel; media_upload is rate-limited per request, not per connection
         media_ids = []
-        for content, filename in images_to_post:
-            media_id = self.upload_media(content, filename)
-            media_ids.append(media_id)
-            time.sleep(0.5)  # Rate limit
+        if contents:
+            _ = self.api  # build the shared v1.1 API once before fanning out
+            with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+                media_ids = list(executor.map(self.upload_media, contents, filenames))
 
         # Post tweet
         try:
             response = self.client.create_tweet(text=text, media_ids=media_ids)
             tweet_id = response.data["id"]
-            logger.info(f"Posted tweet: {tweet_id}")
+            logger.info("Posted tweet: %s", tweet_id)
             return tweet_id
         except tweepy.TweepyException as e:
             status, api_errors, body = _extract_tweepy_error_info(e)
@@ -138,7 +224,7 @@ class XClient:
             if body:
                 detail_parts.append(f"body={body[:500]}")
             if detail_parts:
-                logger.error(f"X post error details: {', '.join(detail_parts)}")
+                logger.error("X post error details: %s", ", ".join(detail_parts))
             msg = f"Failed to post tweet: {e}"
             if status is not None:
                 msg += f" (status {status})"
@@ -149,7 +235,7 @@ class XClient:
         try:
             response = self.client.create_tweet(text=text)
             tweet_id = response.data["id"]
-            logger.info(f"Posted tweet: {tweet_id}")
+            logger.info("Posted tweet: %s", tweet_id)
             return tweet_id
         except tweepy.TweepyException as e:
             raise XAPIError(f"Failed to post tweet: {e}") from e
@@ -0,0 +1,42 @@
+"""Tests for the CLI log handler."""
+
+import io
+import logging
+import time
+
+from auto_post.cli import _BufferedStreamHandler
+
+
+class _CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def _make_record(level: int) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, "message", None, None)
+
+
+def test_buffered_handler_flushes_warnings_immediately():
+    stream = _CountingStream()
+    handler = _BufferedStreamHandler(stream, flush_interval=60)
+
+    handler.handle(_make_record(logging.WARNING))
+
+    assert stream.flushes == 1
+
+
+def test_buffered_handler_flushes_quiet_info_after_interval():
+    stream = _CountingStream()
+    handler = _BufferedStreamHandler(stream, flush_interval=0.05)
+
+    handler.handle(_make_record(logging.INFO))
+    assert stream.flushes == 0
+
+    deadline = time.monotonic() + 2
+    while stream.flushes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stream.flushes == 1
@@ -329,3 +329,210 @@ def test_build_thumbnail_key_keeps_non_volatile_query_params():
     )
 
     assert key1 != key2
+
+
+class _FakeExportNotion:
+    database_id = "works-db"
+
+    def __init__(self, pages: list[dict]):
+        self._pages = pages
+
+    def get_database_info(self, _database_id: str | None = None) -> dict:
+        return {"properties": {"整備済み": {"type": "checkbox"}}}
+
+    def list_database_pages(self, _database_id: str) -> list[dict]:
+        return self._pages
+
+    def get_database_title_map(self, _database_id: str) -> dict[str, str]:
+        return {}
+
+
+def _make_work_page(work_id: str, completed_date: str, ready: bool = True) -> dict:
+    return {
+        "id": work_id,
+        "properties": {
+            "整備済み": {"type": "checkbox", "checkbox": ready},
+            "作品名": {"type": "title", "title": [{"plain_text": work_id}]},
+            "完成日": {"type": "date", "date": {"start": completed_date}},
+            "画像": {
+                "type": "files",
+                "files": [{"type": "external", "external": {"url": f"https://example.com/{work_id}.jpg"}}],
+            },
+        },
+    }
+
+
+def test_export_processes_pages_concurrently_and_merges_stats(monkeypatch):
+    monkeypatch.delenv("NOTION_WORKS_READY_PROP", raising=False)
+    exporter = _make_exporter()
+    exporter.notion = _FakeExportNotion(
+        [
+            _make_work_page("work-b", "2026-01-10"),
+            _make_work_page("work-a", "2026-01-10"),
+            _make_work_page("work-c", "2026-02-01"),
+            _make_work_page("work-d", "2026-03-01", ready=False),
+        ]
+    )
+
+    payload, stats = exporter.export(
+        upload=False,
+        generate_thumbs=False,
+        generate_light_images=False,
+        workers=4,
+    )
+
+    assert [w["id"] for w in payload["works"]] == ["work-c", "work-a", "work-b"]
+    assert stats.total_pages == 4
+    assert stats.exported == 3
+    assert stats.skipped_not_ready == 1
+
+
+def test_thumb_exists_uses_listed_keys_without_head_requests():
+    exporter = _make_exporter()
+    exporter.r2 = None  # any per-key HEAD would fail
+    exporter._existing_thumbs = {"thumbs/work-1-aaaaaaaaaaaa.jpg"}
+
+    assert exporter._thumb_exists("thumbs/work-1-aaaaaaaaaaaa.jpg") is True
+    assert exporter._thumb_exists("thumbs/work-2-bbbbbbbbbbbb.jpg") is False
+
+
+def test_encode_thumbnail_pil_fallback_crops_to_ratio(monkeypatch):
+    import io
+
+    from PIL import Image
+
+    import auto_post.gallery_exporter as gallery_exporter
+
+    monkeypatch.setattr(gallery_exporter, "pyvips", None)
+    src = io.BytesIO()
+    Image.new("RGB", (1200, 800), (200, 100, 50)).save(src, format="JPEG")
+
+    jpeg = gallery_exporter._encode_thumbnail(src.getvalue(), 600)
+
+    thumb = Image.open(io.BytesIO(jpeg))
+    assert thumb.format == "JPEG"
+    assert thumb.size == (600, 750)
+
+
+class _FakeR2:
+    def __init__(self, metadata: dict | None = None):
+        self.metadata = metadata
+        self.put_calls: list[dict] = []
+
+    def get_metadata(self, _key: str) -> dict | None:
+        return self.metadata
+
+    def put_json(self, payload: dict, key: str, **kwargs) -> None:
+        self.put_calls.append({"payload": payload, "key": key, **kwargs})
+
+
+def test_export_skips_gallery_upload_when_content_unchanged(monkeypatch):
+    monkeypatch.delenv("NOTION_WORKS_READY_PROP", raising=False)
+    exporter = _make_exporter()
+    exporter.notion = _FakeExportNotion([_make_work_page("work-a", "2026-01-10")])
+    exporter.r2 = _FakeR2()
+
+    payload, _ = exporter.export(generate_thumbs=False, generate_light_images=False)
+    assert len(exporter.r2.put_calls) == 1
+    digest = exporter.r2.put_calls[0]["metadata"]["gallery-hash"]
+    assert digest == exporter._payload_digest(payload)
+
+    exporter.r2.metadata = {"gallery-hash": digest}
+    exporter.export(generate_thumbs=False, generate_light_images=False)
+    assert len(exporter.r2.put_calls) == 1
+
+
+def _make_cached_exporter(path) -> GalleryExporter:
+    exporter = _make_exporter()
+    exporter._thumb_index_cache = True
+    exporter._thumb_index_path = path
+    exporter._thumb_index_listed_at = None
+    exporter._thumb_index_dirty = False
+    return exporter
+
+
+def test_thumb_index_cache_round_trip(tmp_path):
+    import time
+
+    exporter = _make_cached_exporter(tmp_path / "thumbs_index.json")
+    exporter._existing_thumbs = {"thumbs/work-1-aaaaaaaaaaaa.jpg"}
+    exporter._thumb_index_listed_at = time.time()
+    exporter._thumb_index_dirty = True
+
+    exporter._save_thumb_index()
+
+    assert exporter._load_thumb_index() == {"thumbs/work-1-aaaaaaaaaaaa.jpg"}
+
+
+def test_thumb_index_cache_expires_from_listing_time_not_mtime(tmp_path):
+    import time
+
+    import auto_post.gallery_exporter as gallery_exporter
+
+    path = tmp_path / "thumbs_index.json"
+    exporter = _make_cached_exporter(path)
+    listed_at = time.time() - gallery_exporter.THUMB_INDEX_CACHE_TTL_SECONDS - 60
+    exporter._existing_thumbs = {"thumbs/work-1-aaaaaaaaaaaa.jpg"}
+    exporter._thumb_index_listed_at = listed_at
+    exporter._thumb_index_dirty = True
+
+    # Appending a key rewrites the file (fresh mtime) but keeps the old listing time.
+    exporter._existing_thumbs.add("thumbs/work-2-bbbbbbbbbbbb.jpg")
+    exporter._save_thumb_index()
+
+    assert exporter._load_thumb_index() is None
+
+
+def test_thumb_index_cache_is_opt_in(tmp_path):
+    import time
+
+    path = tmp_path / "thumbs_index.json"
+    exporter = _make_cached_exporter(path)
+    exporter._thumb_index_cache = False
+    exporter._existing_thumbs = {"thumbs/work-1-aaaaaaaaaaaa.jpg"}
+    exporter._thumb_index_listed_at = time.time()
+    exporter._thumb_index_dirty = True
+
+    exporter._save_thumb_index()
+
+    assert not path.exists()
+
+
+def test_export_does_not_reuse_previous_thumbnail_set(monkeypatch):
+    monkeypatch.delenv("NOTION_WORKS_READY_PROP", raising=False)
+    exporter = _make_exporter()
+    exporter.notion = _FakeExportNotion([])
+    exporter._existing_thumbs = {"thumbs/stale-aaaaaaaaaaaa.jpg"}
+
+    exporter.export(upload=False, generate_thumbs=False, generate_light_images=False)
+
+    assert exporter._existing_thumbs is None
+
+
+def test_failed_thumbnail_upload_drops_cached_index(tmp_path):
+    from types import SimpleNamespace
+
+    from auto_post.gallery_exporter import ExportStats
+
+    path = tmp_path / "thumbs_index.json"
+    path.write_bytes(b"{}")
+    exporter = _make_cached_exporter(path)
+    exporter._existing_thumbs = set()
+    exporter._run_cpu = lambda _func, *_args: b"jpeg"
+    response = SimpleNamespace(content=b"image", raise_for_status=lambda: None)
+    exporter.http = SimpleNamespace(get=lambda _url: response)
+
+    def failing_upload(*_args, **_kwargs):
+        raise RuntimeError("R2 unavailable")
+
+    exporter.r2 = SimpleNamespace(upload=failing_upload)
+    stats = ExportStats()
+
+    result = exporter._ensure_thumbnail(
+        "work-1", "https://example.com/a.jpg", 600, overwrite=False, stats=stats
+    )
+
+    assert result is None
+    assert stats.thumb_failed == 1
+    assert exporter._existing_thumbs is None
+    assert not path.exists()
@@ -156,6 +156,18 @@ def test_extract_month_entries_supports_sheet_time_keys():
     assert entries[0].end and entries[0].end.hour == 12
 
 
+def test_extract_month_entries_skips_other_months_and_keeps_unpadded_keys():
+    payload = {
+        "dates": {
+            "2026-05-01": [{"lesson_id": "may-1", "classroom": "東京教室"}],
+            "2026-3-7": [{"lesson_id": "unpadded-1", "classroom": "沼津教室"}],
+            "2026-03-08": [{"lesson_id": "padded-1", "classroom": "つくば教室"}],
+        }
+    }
+    entries = extract_month_entries_from_json(payload, 2026, 3, timezone="Asia/Tokyo")
+    assert sorted(entry.day for entry in entries) == [date(2026, 3, 7), date(2026, 3, 8)]
+
+
 def test_extract_month_entries_from_json_include_adjacent_weeks():
     payload = {
         "dates": {
@@ -3,8 +3,11 @@
 from datetime import datetime
 from unittest.mock import Mock
 
+import pytest
+
 from auto_post.notion_db import WorkItem
-from auto_post.poster import Poster, generate_caption
+from auto_post.poster import Poster, download_image_from_url, generate_caption
+from auto_post.x_twitter import XAPIError
 
 
 def _make_work(page_id: str, work_name: str, creation_date: datetime) -> WorkItem:
@@ -183,3 +186,75 @@ class TestRunDailyPost:
 
         assert posted_ids == ["old-1"]
         assert result["processed"] == ["oldest"]
+
+
+class TestProcessPost:
+    def test_records_each_platform_as_soon_as_it_posts(self, monkeypatch):
+        poster = object.__new__(Poster)
+        poster.notion = Mock()
+        poster.config = Mock(default_tags="#default")
+        poster._post_to_instagram = lambda _images, _caption: "ig-1"  # type: ignore[method-assign]
+        poster._post_to_x = lambda _images, _caption: "x-1"  # type: ignore[method-assign]
+
+        monkeypatch.setattr(
+            "auto_post.poster.download_image_from_url", lambda _url: (b"data", "test.jpg")
+        )
+
+        work = _make_work("page-1", "ふくろう", datetime(2026, 1, 5))
+        status = poster._process_post(work, platforms=["instagram", "x"])
+
+        assert status["instagram"] is True
+        assert status["x"] is True
+        calls = poster.notion.update_post_status.call_args_list
+        assert len(calls) == 2
+        written = {}
+        for call in calls:
+            assert call.args == ("page-1",)
+            assert "error_log" not in call.kwargs
+            written.update(call.kwargs)
+        assert written["ig_posted"] is True
+        assert written["ig_post_id"] == "ig-1"
+        assert written["x_posted"] is True
+        assert written["x_post_id"] == "x-1"
+
+    def test_error_log_write_does_not_mask_unexpected_error(self, monkeypatch):
+        poster = object.__new__(Poster)
+        poster.notion = Mock()
+        poster.notion.update_post_status.side_effect = RuntimeError("notion down")
+        poster.config = Mock(default_tags="#default")
+        poster._post_with_retry = lambda _label, fn, _retry: fn()  # type: ignore[method-assign]
+
+        def fail_x(_images, _caption):
+            raise XAPIError("rate limited")
+
+        def crash_ig(_images, _caption):
+            raise KeyError("boom")
+
+        poster._post_to_instagram = crash_ig  # type: ignore[method-assign]
+        poster._post_to_x = fail_x  # type: ignore[method-assign]
+        monkeypatch.setattr(
+            "auto_post.poster.download_image_from_url", lambda _url: (b"data", "test.jpg")
+        )
+
+        work = _make_work("page-1", "ふくろう", datetime(2026, 1, 5))
+        with pytest.raises(KeyError):
+            poster._process_post(work, platforms=["instagram", "x"])
+
+
+class TestDownloadImageFromUrl:
+    def test_retries_rate_limited_response_using_retry_after(self, monkeypatch):
+        responses = [
+            Mock(status_code=429, headers={"Retry-After": "3"}),
+            Mock(status_code=200, headers={}, content=b"image-bytes"),
+        ]
+        sleeps: list[float] = []
+        monkeypatch.setattr(
+            "auto_post.poster._DOWNLOAD_SESSION.get", lambda _url, timeout: responses.pop(0)
+        )
+        monkeypatch.setattr("auto_post.poster.time.sleep", sleeps.append)
+
+        content, filename = download_image_from_url("https://example.com/owl.png?sig=1")
+
+        assert content == b"image-bytes"
+        assert filename == "owl.png"
+        assert sleeps == [3.0]
@@ -0,0 +1,42 @@
+"""Tests for r2_storage module."""
+
+import io
+
+from auto_post.config import R2Config
+from auto_post.r2_storage import R2Storage
+
+
+class _FakeS3:
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+    def get_object(self, **_kwargs) -> dict:
+        return {"Body": io.BytesIO(self.body), "ETag": self.etag}
+
+
+def _make_storage(client: _FakeS3) -> R2Storage:
+    storage = R2Storage(
+        R2Config(
+            account_id="account",
+            access_key_id="key",
+            secret_access_key="secret",
+            bucket_name="bucket",
+            public_url=None,
+        )
+    )
+    storage._client = client
+    return storage
+
+
+def test_get_json_with_etag_keeps_etag_when_body_is_corrupted():
+    storage = _make_storage(_FakeS3(b'{"access_token": ', '"etag-1"'))
+
+    assert storage.get_json_with_etag("config/instagram_token.json") == (None, '"etag-1"')
+    assert storage.get_json("config/instagram_token.json") is None
+
+
+def test_get_json_with_etag_parses_body():
+    storage = _make_storage(_FakeS3(b'{"access_token": "tok"}', '"etag-2"'))
+
+    assert storage.get_json_with_etag("k") == ({"access_token": "tok"}, '"etag-2"')
@@ -0,0 +1,182 @@
+"""Tests for token_manager module."""
+
+from datetime import datetime, timedelta
+
+from auto_post.config import InstagramConfig
+from auto_post.r2_storage import R2PreconditionFailedError
+from auto_post.token_manager import TokenManager
+
+
+class _FakeR2:
+    def __init__(
+        self,
+        stored: dict | None = None,
+        etag: str | None = None,
+        read_error: Exception | None = None,
+    ):
+        self.stored = stored
+        self.etag = etag
+        self.read_error = read_error
+        self.get_calls = 0
+        self.put_calls: list[dict] = []
+        self.put_kwargs: list[dict] = []
+
+    def get_json_with_etag(self, _key: str) -> tuple[dict | None, str | None]:
+        self.get_calls += 1
+        if self.read_error is not None:
+            raise self.read_error
+        if self.etag is not None:
+            return self.stored, self.etag
+        return self.stored, '"etag-1"' if self.stored else None
+
+    def put_json(self, data: dict, _key: str, **kwargs) -> str:
+        self.put_calls.append(data)
+        self.put_kwargs.append(kwargs)
+        self.stored = data
+        return f'"etag-{len(self.put_calls) + 1}"'
+
+
+def _make_config(access_token: str = "env-token") -> InstagramConfig:
+    return InstagramConfig(
+        app_id="app-id",
+        app_secret="app-secret",
+        access_token=access_token,
+        business_account_id="ig-account",
+    )
+
+
+def test_get_valid_token_memoizes_token_with_distant_expiry():
+    expires_at = datetime.now() + timedelta(days=50)
+    r2 = _FakeR2({"access_token": "stored-token", "expires_at": expires_at.isoformat()})
+    manager = TokenManager(r2, _make_config())
+
+    assert manager.get_valid_token() == "stored-token"
+    assert manager.get_valid_token() == "stored-token"
+    assert r2.get_calls == 1
+
+
+def test_get_valid_token_refreshes_when_expiry_unknown(monkeypatch):
+    r2 = _FakeR2(None)
+    manager = TokenManager(r2, _make_config())
+    requested: list[str] = []
+
+    def fake_request_token(current_token: str, **_kwargs):
+        requested.append(current_token)
+        return {"access_token": "fresh-token", "expires_in": 60 * 24 * 60 * 60}, None
+
+    monkeypatch.setattr(manager, "_request_token", fake_request_token)
+
+    assert manager.get_valid_token() == "fresh-token"
+    assert requested == ["env-token"]
+    assert r2.put_calls[0]["access_token"] == "fresh-token"
+    assert "expires_at" in r2.put_calls[0]
+
+
+def test_get_valid_token_refreshes_expired_stored_token_with_env_token(monkeypatch):
+    expires_at = datetime.now() - timedelta(days=1)
+    r2 = _FakeR2({"access_token": "dead-token", "expires_at": expires_at.isoformat()})
+    manager = TokenManager(r2, _make_config())
+    requested: list[str] = []
+
+    def fake_request_token(current_token: str, **_kwargs):
+        requested.append(current_token)
+        return None, {"error": {"message": "expired"}}
+
+    monkeypatch.setattr(manager, "_request_token", fake_request_token)
+
+    assert manager.get_valid_token() == "env-token"
+    assert requested == ["env-token"]
+
+
+def test_force_refresh_reuses_resolved_token(monkeypatch):
+    expires_at = datetime.now() + timedelta(days=50)
+    r2 = _FakeR2({"access_token": "stored-token", "expires_at": expires_at.isoformat()})
+    manager = TokenManager(r2, _make_config())
+    requested: list[str] = []
+
+    def fake_request_token(current_token: str, **_kwargs):
+        requested.append(current_token)
+        return {"access_token": "fresh-token", "expires_in": 60 * 24 * 60 * 60}, None
+
+    monkeypatch.setattr(manager, "_request_token", fake_request_token)
+
+    assert manager.get_valid_token() == "stored-token"
+    assert manager.force_refresh() == "fresh-token"
+    assert requested == ["stored-token"]
+    assert r2.get_calls == 1
+
+
+def test_save_token_writes_iso_and_timestamp_expiry():
+    r2 = _FakeR2(None)
+    manager = TokenManager(r2, _make_config())
+
+    manager._save_token("fresh-token", 3600)
+
+    saved = r2.put_calls[0]
+    assert datetime.fromisoformat(saved["expires_at"]).utcoffset() == timedelta(0)
+    assert datetime.fromisoformat(saved["expires_at"]).timestamp() == saved["expires_at_ts"]
+    assert manager._load_stored_token() == ("fresh-token", saved["expires_at_ts"])
+
+
+def test_save_token_guards_put_with_stored_etag(monkeypatch):
+    expires_at = datetime.now() + timedelta(days=5)
+    r2 = _FakeR2({"access_token": "stored-token", "expires_at": expires_at.isoformat()})
+    manager = TokenManager(r2, _make_config())
+    monkeypatch.setattr(
+        manager,
+        "_request_token",
+        lambda current_token, **_kwargs: ({"access_token": "fresh-token", "expires_in": 3600}, None),
+    )
+
+    assert manager.get_valid_token() == "fresh-token"
+    assert r2.put_kwargs[0]["if_match"] == '"etag-1"'
+
+
+def test_save_token_creates_missing_entry_only_if_absent_and_tracks_new_etag():
+    r2 = _FakeR2(None)
+    manager = TokenManager(r2, _make_config())
+    manager._load_stored_token()
+
+    manager._save_token("first-token", 3600)
+    manager._save_token("second-token", 7200)
+
+    assert r2.put_kwargs[0] == {"if_match": None, "if_none_match": "*"}
+    assert r2.put_kwargs[1] == {"if_match": '"etag-2"', "if_none_match": None}
+
+
+def test_save_token_overwrites_corrupted_entry_using_its_etag():
+    # Body failed to parse, but the object exists: (None, etag)
+    r2 = _FakeR2(None, etag='"etag-corrupt"')
+    manager = TokenManager(r2, _make_config())
+    manager._load_stored_token()
+
+    manager._save_token("fresh-token", 3600)
+
+    assert r2.put_kwargs[0] == {"if_match": '"etag-corrupt"', "if_none_match": None}
+
+
+def test_save_token_writes_unconditionally_when_entry_could_not_be_read():
+    r2 = _FakeR2(read_error=TimeoutError("read timed out"))
+    manager = TokenManager(r2, _make_config())
+
+    assert manager._load_stored_token() == (None, None)
+    manager._save_token("fresh-token", 3600)
+
+    assert r2.put_kwargs[0] == {"if_match": None, "if_none_match": None}
+
+
+def test_save_token_keeps_stored_entry_when_it_changed_concurrently():
+    expires_at = datetime.now() + timedelta(days=50)
+    r2 = _FakeR2({"access_token": "stored-token", "expires_at": expires_at.isoformat()})
+    manager = TokenManager(r2, _make_config())
+    manager._load_stored_token()
+
+    def conflicting_put_json(_data: dict, key: str, **_kwargs) -> str:
+        raise R2PreconditionFailedError(key)
+
+    r2.put_json = conflicting_put_json
+    manager._save_token("fresh-token", 60 * 24 * 60 * 60)
+
+    assert manager._stored_etag == '"etag-1"'
+    assert manager.get_valid_token() == "fresh-token"
+    assert r2.get_calls == 1
@@ -0,0 +1,90 @@
+"""Tests for x_twitter module."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from auto_post.config import XConfig
+from auto_post.x_twitter import SlidingWindowLimiter, XClient
+
+
+def _make_client() -> XClient:
+    client = XClient(
+        XConfig(
+            api_key="key",
+            api_key_secret="secret",
+            access_token="token",
+            access_token_secret="token-secret",
+        )
+    )
+    client._api = Mock()
+    client._client = Mock()
+    return client
+
+
+def test_post_with_images_keeps_media_order(monkeypatch):
+    monkeypatch.setattr("auto_post.x_twitter.X_MAX_IMAGES", 4)
+    client = _make_client()
+    client._api.media_upload.side_effect = lambda filename, file: SimpleNamespace(
+        media_id_string=f"id-{filename}"
+    )
+    client._client.create_tweet.return_value = SimpleNamespace(data={"id": "tweet-1"})
+
+    images = [(b"a", "1.jpg"), (b"b", "2.jpg"), (b"c", "3.jpg")]
+
+    assert client.post_with_images("hello", images) == "tweet-1"
+    client._client.create_tweet.assert_called_once_with(
+        text="hello", media_ids=["id-1.jpg", "id-2.jpg", "id-3.jpg"]
+    )
+
+
+def test_post_text_only_does_not_build_v1_api():
+    client = _make_client()
+    client._api = None
+    client._client.create_tweet.return_value = SimpleNamespace(data={"id": "tweet-2"})
+
+    assert client.post_text_only("hello") == "tweet-2"
+    assert client._api is None
+
+
+def test_post_with_images_soa_truncates_to_max_images(monkeypatch):
+    monkeypatch.setattr("auto_post.x_twitter.X_MAX_IMAGES", 2)
+    client = _make_client()
+    client._api.media_upload.side_effect = lambda filename, file: SimpleNamespace(
+        media_id_string=f"id-{filename}"
+    )
+    client._client.create_tweet.return_value = SimpleNamespace(data={"id": "tweet-3"})
+
+    result = client.post_with_images_soa("hi", [b"a", b"b", b"c"], ["1.jpg", "2.jpg", "3.jpg"])
+
+    assert result == "tweet-3"
+    client._client.create_tweet.assert_called_once_with(text="hi", media_ids=["id-1.jpg", "id-2.jpg"])
+
+
+def test_sliding_window_limiter_sleeps_only_when_full(monkeypatch):
+    clock = [100.0]
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr("auto_post.x_twitter.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("auto_post.x_twitter.time.sleep", fake_sleep)
+    limiter = SlidingWindowLimiter(limit=2, window=10.0)
+
+    limiter.acquire()
+    clock[0] += 1.0
+    limiter.acquire()
+    assert sleeps == []
+
+    limiter.acquire()
+    assert sleeps == [9.0]
+
+
+def test_clients_with_same_credentials_share_tweepy_objects():
+    first = XClient(XConfig("key", "secret", "token", "token-secret"))
+    second = XClient(XConfig("key", "secret", "token", "token-secret"))
+
+    assert first.client is second.client
+    assert first.api is second.api
+    assert first._upload_limiter is second._upload_limiter